@@ -0,0 +1,104 @@
+# ---------------------------
+# MICROBENCHMARK: MEMBANGUN BARIS TABEL
+# ---------------------------
+# Membandingkan biaya per baris saat membangun <tr> neraca saldo:
+# - concat   : rows += f"..." (cara lama) dengan referensi kedua ke string,
+#              sehingga optimasi in-place CPython tidak berlaku (kuadratik)
+# - join     : potongan dikumpulkan di list lalu "".join (linear)
+# - makro    : makro tabel.baris_saldo dari templates/_tabel.html, satu
+#              panggilan per tabel dengan loop Jinja di dalamnya (yang dipakai
+#              aplikasi; nilai di-escape otomatis)
+#
+# Jalankan dari root repo:
+#   python benchmarks/bench_baris_tabel.py
+#   python benchmarks/bench_baris_tabel.py --baris 1000,10000,100000 --ulang 3
+#
+# Yang diharapkan: us/baris "join" dan "makro" tetap datar dari 1k sampai 100k
+# baris, sedangkan "concat" naik seiring jumlah baris.
+import argparse, os, sys, time
+
+from jinja2 import Environment, FileSystemLoader, select_autoescape
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "extensions"))
+from uang import rupiah_sen
+
+env = Environment(
+    loader=FileSystemLoader(os.path.join(ROOT, "extensions", "templates")),
+    autoescape=select_autoescape(default=True),
+)
+env.filters["rupiah"] = rupiah_sen
+TEMPLATE_MAKRO = env.from_string(
+    '{% import "_tabel.html" as tabel %}'
+    "{{ tabel.baris_saldo(baris) }}"
+)
+
+def buat_baris(jumlah):
+    return [
+        {"kode": f"1-{i % 10000:04d}", "nama": f"Akun <{i}> & Co", "debit": i * 137 % 10_000_000, "kredit": 0}
+        for i in range(jumlah)
+    ]
+
+def html_baris(b):
+    debit = rupiah_sen(b["debit"]) if b["debit"] else "-"
+    kredit = rupiah_sen(b["kredit"]) if b["kredit"] else "-"
+    return f"""
+                    <tr>
+                        <td>{b['kode']}</td>
+                        <td>{b['nama']}</td>
+                        <td style="text-align:right;">{debit}</td>
+                        <td style="text-align:right;">{kredit}</td>
+                    </tr>
+"""
+
+def concat(baris):
+    rows = ""
+    for b in baris:
+        # Referensi kedua ke string yang sedang dibangun (mis. disimpan untuk
+        # log/debug) membuat += tidak bisa memperbesar string di tempat
+        sebelumnya = rows
+        rows += html_baris(b)
+    return rows
+
+def join(baris):
+    return "".join([html_baris(b) for b in baris])
+
+def makro(baris):
+    return TEMPLATE_MAKRO.render(baris=baris)
+
+def ukur(fungsi, baris, ulang):
+    terbaik = None
+    for _ in range(ulang):
+        mulai = time.perf_counter()
+        fungsi(baris)
+        durasi = time.perf_counter() - mulai
+        terbaik = durasi if terbaik is None else min(terbaik, durasi)
+    return terbaik
+
+def main():
+    parser = argparse.ArgumentParser(description="Microbenchmark membangun baris tabel HTML")
+    parser.add_argument("--baris", default="1000,10000,100000", help="jumlah baris, pisahkan dengan koma")
+    parser.add_argument("--ulang", type=int, default=3, help="pengulangan per ukuran (diambil yang tercepat)")
+    parser.add_argument("--maks-concat", type=int, default=20000,
+                        help="cara lama (kuadratik) hanya diukur sampai jumlah baris ini")
+    args = parser.parse_args()
+
+    # Nilai teks harus di-escape oleh makro
+    contoh = makro(buat_baris(1))
+    assert "&lt;0&gt; &amp; Co" in contoh, contoh
+
+    cara = [("concat", concat), ("join", join), ("makro", makro)]
+
+    print(f"{'baris':>8} " + " ".join(f"{nama + ' us/baris':>18}" for nama, _ in cara))
+    for jumlah in (int(x) for x in args.baris.split(",")):
+        baris = buat_baris(jumlah)
+        kolom = []
+        for nama, fungsi in cara:
+            if nama == "concat" and jumlah > args.maks_concat:
+                kolom.append(f"{'-':>18}")
+                continue
+            kolom.append(f"{ukur(fungsi, baris, args.ulang) / jumlah * 1e6:>18.3f}")
+        print(f"{jumlah:>8} " + " ".join(kolom), flush=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,253 @@
+# ---------------------------
+# BENCHMARK ROUTE (LEDGER SINTETIS)
+# ---------------------------
+# Mengukur setiap halaman laporan lewat Flask test client terhadap ledger
+# sintetis (ledger_sintetis.py) berbagai ukuran, dengan backend lokal:
+# - postgrest : PenyimpananSupabase + PostgREST palsu (jalur produksi, query
+#               dihitung per round-trip, latensi jaringan bisa ditambahkan)
+# - sqlite    : PenyimpananSQLite langsung (query = statement SQL)
+# Cache laporan dikosongkan sebelum setiap request, jadi yang diukur selalu
+# jalur baca data + hitung + render.
+#
+# Per route dicatat: persentil latensi (ms), jumlah query, baris yang dibaca
+# (postgrest), ukuran respons dan memori puncak (tracemalloc, satu run
+# terpisah agar tidak memperlambat pengukuran waktu). Hasil disimpan ke JSON;
+# --banding membandingkan dengan hasil sebelumnya dan keluar dengan kode 1
+# jika ada route yang query-nya bertambah, atau yang lebih lambat dari
+# toleransi relatif dan lantai absolut (--lantai-ms) sekaligus, baik di p50
+# maupun di waktu tercepat (min). Waktu tercepat hampir tidak terpengaruh
+# gangguan sesaat di mesin, jadi satu request yang kebetulan lambat tidak
+# membuat run gagal. Route dengan sampel terlalu sedikit hanya diberi peringatan.
+#
+# Jalankan dari root repo:
+#   python benchmarks/bench_route.py
+#   python benchmarks/bench_route.py --ukuran 1000,10000,100000,1000000 --data /tmp/ledger
+#   python benchmarks/bench_route.py --latensi 20 --keluaran /tmp/baru.json --banding benchmarks/baseline_route.json
+import argparse, datetime, json, os, platform, sqlite3, sys, tempfile, time, tracemalloc
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, ROOT)
+import ledger_sintetis
+from ledger_sintetis import USER_UTAMA
+from postgrest_palsu import TransportPostgREST, buat_client_palsu, ROUTE_GET
+
+from penyimpanan.db_supabase import PenyimpananSupabase
+from penyimpanan.db_sqlite import PenyimpananSQLite
+
+PERSENTIL = (50, 90, 95, 99)
+
+class SQLiteTerhitung(PenyimpananSQLite):
+    """
+    PenyimpananSQLite yang menghitung statement SQL dari aplikasi
+    (statement di dalam trigger dan pragma tidak ikut)
+    """
+
+    jumlah_query = 0
+
+    def _buka(self):
+        conn = super()._buka()
+        conn.set_trace_callback(self._catat)
+        return conn
+
+    def _catat(self, sql):
+        if sql.lstrip()[:6].lower() in ("select", "insert", "delete", "update"):
+            self.jumlah_query += 1
+
+def persentil(data, p):
+    """Persentil dengan interpolasi linear (data sudah urut)"""
+    if len(data) == 1:
+        return data[0]
+    posisi = (len(data) - 1) * p / 100
+    bawah = int(posisi)
+    atas = min(bawah + 1, len(data) - 1)
+    return data[bawah] + (data[atas] - data[bawah]) * (posisi - bawah)
+
+def siapkan_data(folder, ukuran, seed):
+    """
+    File ledger untuk satu ukuran; dipakai ulang jika sudah ada di folder
+    """
+    path = os.path.join(folder, f"ledger_{ukuran}_s{seed}.db")
+    if os.path.exists(path):
+        return path, None, 0.0
+    mulai = time.perf_counter()
+    ringkasan = ledger_sintetis.muat(path, ukuran, seed=seed)
+    return path, ringkasan, time.perf_counter() - mulai
+
+def buat_backend(nama, path, latensi):
+    if nama == "sqlite":
+        return SQLiteTerhitung(path), None
+    transport = TransportPostgREST(path, latensi=latensi)
+    return PenyimpananSupabase(buat_client_palsu(transport)), transport
+
+def ukur_route(app_modul, client, route, ulang, maks_detik, backend, transport):
+    """
+    Satu route: `ulang` kali request (berhenti lebih awal jika total melewati
+    maks_detik), lalu satu request lagi di bawah tracemalloc
+    """
+    def kirim():
+        app_modul._cache_laporan.data.clear()
+        res = client.get(route)
+        isi = res.get_data()
+        return res.status_code, len(isi)
+
+    # Pemanasan: template terkompilasi, koneksi per thread terbuka
+    kirim()
+
+    waktu = []
+    query = baris = None
+    total = time.perf_counter()
+    for i in range(ulang):
+        if transport:
+            transport.reset()
+        else:
+            backend.jumlah_query = 0
+        mulai = time.perf_counter()
+        status, ukuran_respons = kirim()
+        waktu.append((time.perf_counter() - mulai) * 1000)
+        if i == 0:
+            if transport:
+                query = sum(transport.ringkasan().values())
+                baris = sum(c["baris"] for c in transport.catatan if c["metode"] == "GET")
+            else:
+                query = backend.jumlah_query
+        if time.perf_counter() - total > maks_detik:
+            break
+
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    kirim()
+    memori = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    waktu.sort()
+    hasil = {
+        "status": status,
+        "n": len(waktu),
+        "min_ms": round(waktu[0], 2),
+        "rata_ms": round(sum(waktu) / len(waktu), 2),
+        "maks_ms": round(waktu[-1], 2),
+        "query": query,
+        "baris_dibaca": baris,
+        "byte_respons": ukuran_respons,
+        "memori_puncak_kb": round(memori / 1024),
+    }
+    for p in PERSENTIL:
+        hasil[f"p{p}_ms"] = round(persentil(waktu, p), 2)
+    return hasil
+
+# Sampel minimum per route agar perbandingan waktu dianggap bermakna
+MIN_SAMPEL_BANDING = 5
+
+def lebih_lambat(lama_ms, baru_ms, toleransi, lantai_ms):
+    """Baru melewati lama dengan toleransi relatif DAN selisih absolut > lantai_ms"""
+    return baru_ms > lama_ms * (1 + toleransi) and baru_ms - lama_ms > lantai_ms
+
+def bandingkan(lama, baru, toleransi, lantai_ms=5.0):
+    """
+    (regresi, peringatan) berupa daftar teks, untuk ukuran & route yang ada di
+    keduanya. Regresi: jumlah query bertambah, atau p50 dan min_ms sama-sama
+    lebih lambat (lebih_lambat). Route dengan sampel kurang dari
+    MIN_SAMPEL_BANDING hanya masuk peringatan.
+    """
+    regresi, peringatan = [], []
+    for ukuran, data in baru["ukuran"].items():
+        for route, r in data["route"].items():
+            l = lama.get("ukuran", {}).get(ukuran, {}).get("route", {}).get(route)
+            if not l:
+                continue
+            if l.get("query") is not None and (r.get("query") or 0) > l["query"]:
+                regresi.append(f"{ukuran} {route}: query {l['query']} -> {r['query']}")
+
+            p50 = lebih_lambat(l["p50_ms"], r["p50_ms"], toleransi, lantai_ms)
+            # Hasil lama tanpa min_ms: hanya p50 yang bisa dibandingkan
+            tercepat = "min_ms" not in l or lebih_lambat(l["min_ms"], r["min_ms"], toleransi, lantai_ms)
+            if not (p50 and tercepat):
+                continue
+            teks = f"{ukuran} {route}: p50 {l['p50_ms']} -> {r['p50_ms']} ms, min {l.get('min_ms', '-')} -> {r['min_ms']} ms"
+            if min(r.get("n", 0), l.get("n", MIN_SAMPEL_BANDING)) < MIN_SAMPEL_BANDING:
+                peringatan.append(f"{teks} (sampel terlalu sedikit: {l.get('n')}/{r.get('n')})")
+            else:
+                regresi.append(teks)
+    return regresi, peringatan
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark semua halaman laporan dengan ledger sintetis")
+    parser.add_argument("--ukuran", default="1000,10000", help="baris jurnal umum, dipisah koma (1000 .. 1000000)")
+    parser.add_argument("--backend", choices=("postgrest", "sqlite"), default="postgrest")
+    parser.add_argument("--latensi", type=float, default=0, help="ms per round-trip (hanya postgrest)")
+    parser.add_argument("--ulang", type=int, default=20, help="request per route")
+    parser.add_argument("--maks-detik", type=float, default=30, help="batas waktu pengulangan per route")
+    parser.add_argument("--route", default="", help="hanya route ini (dipisah koma)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--data", help="folder file ledger (dipakai ulang antar run); default folder sementara")
+    parser.add_argument("--keluaran", help="file JSON hasil")
+    parser.add_argument("--banding", help="file JSON hasil sebelumnya untuk dibandingkan")
+    parser.add_argument("--toleransi", type=float, default=0.2, help="kenaikan p50/min yang masih diterima (0.2 = 20%%)")
+    parser.add_argument("--lantai-ms", type=float, default=5.0, help="kenaikan absolut (ms) yang selalu diterima")
+    args = parser.parse_args()
+
+    folder = args.data or tempfile.mkdtemp(prefix="bench-belut-")
+    os.makedirs(folder, exist_ok=True)
+    routes = [r for r in args.route.split(",") if r] or ROUTE_GET
+
+    # Aplikasi di-import dengan backend sqlite kosong; per ukuran diganti
+    os.environ["STORAGE_BACKEND"] = "sqlite"
+    os.environ["SQLITE_PATH"] = os.path.join(folder, "kosong.db")
+    os.environ.setdefault("SECRET_KEY", "bench")
+    import belut_in_app
+
+    client = belut_in_app.app.test_client()
+    with client.session_transaction() as s:
+        s["user_email"] = USER_UTAMA
+
+    hasil = {
+        "dibuat": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "mesin": platform.platform(),
+        "backend": args.backend,
+        "latensi_ms": args.latensi,
+        "ulang": args.ulang,
+        "seed": args.seed,
+        "ukuran": {},
+    }
+    for ukuran in [int(u) for u in args.ukuran.split(",") if u]:
+        path, ringkasan, detik_muat = siapkan_data(folder, ukuran, args.seed)
+        if ringkasan:
+            print(f"== {ukuran} baris: dimuat dalam {detik_muat:.1f} detik {ringkasan[USER_UTAMA]}")
+        else:
+            print(f"== {ukuran} baris: {path}")
+
+        backend, transport = buat_backend(args.backend, path, args.latensi / 1000)
+        belut_in_app.penyimpanan = backend
+        data = {"baris_jurnal": ukuran, "detik_muat": round(detik_muat, 1) if ringkasan else None, "route": {}}
+
+        print(f"{'route':<38}{'p50':>9}{'p90':>9}{'p99':>9}{'query':>7}{'baris':>9}{'KB puncak':>11}")
+        for route in routes:
+            r = ukur_route(belut_in_app, client, route, args.ulang, args.maks_detik, backend, transport)
+            data["route"][route] = r
+            print(f"{route:<38}{r['p50_ms']:>9.1f}{r['p90_ms']:>9.1f}{r['p99_ms']:>9.1f}"
+                  f"{r['query']:>7}{r['baris_dibaca'] if r['baris_dibaca'] is not None else '-':>9}"
+                  f"{r['memori_puncak_kb']:>11}")
+            if r["status"] != 200:
+                print(f"  ! status {r['status']}")
+        hasil["ukuran"][str(ukuran)] = data
+
+    if args.keluaran:
+        with open(args.keluaran, "w") as f:
+            json.dump(hasil, f, indent=2)
+        print(f"hasil disimpan ke {args.keluaran}")
+
+    if args.banding:
+        with open(args.banding) as f:
+            regresi, peringatan = bandingkan(json.load(f), hasil, args.toleransi, args.lantai_ms)
+        for p in peringatan:
+            print(f"PERINGATAN {p}")
+        for r in regresi:
+            print(f"REGRESI {r}")
+        if regresi:
+            sys.exit(1)
+        print(f"tidak ada regresi dibanding {args.banding}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+# ---------------------------
+# LEDGER SINTETIS PETERNAKAN BELUT
+# ---------------------------
+# Membuat data pembukuan beberapa tahun untuk satu peternakan belut dari
+# DAFTAR_AKUN, dengan pola transaksi yang mirip pemakaian nyata:
+# - penjualan belut standar/super (tunai, transfer, kredit) sesuai harga per kg
+# - pembelian pakan & bibit (tunai, transfer, utang), pelunasan piutang/utang
+# - beban listrik & perlengkapan, bunga/administrasi bank, prive
+# - setiap akhir bulan: penyusutan bangunan/kendaraan/peralatan, HPP dan
+#   pemakaian pakan (jurnal penyesuaian)
+# - saldo awal aset tetap, kas, bank dan modal
+# Semua acak dari seed, jadi ukuran & seed yang sama selalu menghasilkan data
+# yang sama (hasil benchmark bisa dibandingkan antar commit).
+#
+# Ukuran dihitung dalam baris journal_lines (satu jurnal = 2 baris), dari 1k
+# sampai 1M. Data dimuat langsung ke file SQLite berskema penyimpanan/db_sqlite.py,
+# yang juga dipakai PostgREST palsu (postgrest_palsu.py).
+#
+#   python benchmarks/ledger_sintetis.py --baris 100000 --keluaran /tmp/ledger.db
+import argparse, datetime, os, random, sys, time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "extensions"))
+from akun import AKUN_PER_KODE
+from uang import ke_sen, bagi_sen, kali_sen
+from penyimpanan.db_sqlite import PenyimpananSQLite
+
+USER_UTAMA = "peternak@belut.test"
+# User lain di database yang sama: laporan harus tetap hanya membaca data miliknya
+USER_TETANGGA = "tetangga@belut.test"
+
+HARGA_PER_KG = {"4-1110": 50000, "4-1120": 65000}
+
+# Saldo awal (rupiah): aset tetap dan kas dibiayai modal pemilik
+SALDO_AWAL = {
+    "1-1100": 25_000_000, "1-1110": 150_000_000, "1-2100": 200_000_000,
+    "1-2200": 120_000_000, "1-2300": 48_000_000, "1-2400": 24_000_000,
+}
+
+# Penyusutan per bulan: (akun aset, akun akumulasi, umur bulan)
+PENYUSUTAN = (("1-2200", "1-2210", 8 * 12), ("1-2300", "1-2310", 4 * 12), ("1-2400", "1-2410", 4 * 12))
+
+def _baris(kode_debit, kode_kredit, sen):
+    return [
+        (kode_debit, AKUN_PER_KODE[kode_debit]["nama"], sen, 0),
+        (kode_kredit, AKUN_PER_KODE[kode_kredit]["nama"], 0, sen),
+    ]
+
+def _penjualan(acak):
+    kode = acak.choice(("4-1110", "4-1110", "4-1120"))
+    kg = acak.choice((0.5, 1, 1.5, 2, 2.5, 3, 5, 8, 10, 15, 25))
+    metode, akun = acak.choices((("Tunai", "1-1100"), ("Transfer", "1-1110"), ("Kredit", "1-1200")), (5, 3, 2))[0]
+    nama = AKUN_PER_KODE[kode]["nama"].replace("Penjualan ", "")
+    return f"Penjualan {nama} - {kg} kg ({metode})", _baris(akun, kode, kali_sen(ke_sen(HARGA_PER_KG[kode]), kg))
+
+def _pembelian(acak):
+    kode = acak.choices(("5-1310", "5-1320", "5-1210", "5-1220"), (4, 3, 2, 1))[0]
+    nominal = ke_sen(acak.randrange(50, 2500) * 1000)
+    metode, akun = acak.choices((("Tunai", "1-1100"), ("Transfer", "1-1110"), ("Kredit", "2-1100")), (4, 4, 2))[0]
+    return f"Pembelian {AKUN_PER_KODE[kode]['nama']} ({metode})", _baris(kode, akun, nominal)
+
+def _lainnya(acak):
+    jenis = acak.choices(("listrik", "perlengkapan", "piutang", "utang", "prive", "bank"), (3, 2, 3, 2, 2, 1))[0]
+    if jenis == "listrik":
+        return "Transaksi Lainnya: bayar listrik & air kolam", _baris("6-1100", "1-1100", ke_sen(acak.randrange(150, 900) * 1000))
+    if jenis == "perlengkapan":
+        return "Transaksi Lainnya: perlengkapan kolam", _baris("6-1200", "1-1100", ke_sen(acak.randrange(20, 400) * 1000))
+    if jenis == "piutang":
+        return "Transaksi Lainnya: pelunasan piutang pelanggan", _baris("1-1110", "1-1200", ke_sen(acak.randrange(100, 1500) * 1000))
+    if jenis == "utang":
+        return "Transaksi Lainnya: bayar utang pemasok pakan", _baris("2-1100", "1-1110", ke_sen(acak.randrange(100, 1500) * 1000))
+    if jenis == "prive":
+        return "Transaksi Lainnya: prive", _baris("3-1200", "1-1100", ke_sen(acak.randrange(100, 2000) * 1000))
+    kode = acak.choice(("9-1100", "9-1200", "8-1100"))
+    if kode == "8-1100":
+        return "Transaksi Lainnya: bunga tabungan", _baris("1-1110", kode, ke_sen(acak.randrange(1, 200) * 1000))
+    return f"Transaksi Lainnya: {AKUN_PER_KODE[kode]['nama'].lower()}", _baris(kode, "1-1110", ke_sen(acak.randrange(5, 300) * 1000))
+
+POLA_TRANSAKSI = ((_penjualan, 5), (_pembelian, 3), (_lainnya, 2))
+
+def buat_jurnal(jumlah_baris, tahun=3, tahun_mulai=2022, seed=1):
+    """
+    Generator (tanggal, keterangan, baris) urut tanggal; baris berisi tuple
+    (kode, nama, debit sen, kredit sen). Jumlah baris total = jumlah_baris
+    (dibulatkan ke bawah ke kelipatan 2).
+    """
+    acak = random.Random(seed)
+    awal = datetime.date(tahun_mulai, 1, 1)
+    hari = (datetime.date(tahun_mulai + tahun, 1, 1) - awal).days
+    jumlah = max(jumlah_baris // 2, 1)
+    pola, bobot = zip(*POLA_TRANSAKSI)
+    for i in range(jumlah):
+        tanggal = awal + datetime.timedelta(days=i * hari // jumlah)
+        keterangan, baris = acak.choices(pola, bobot)[0](acak)
+        yield tanggal.isoformat(), keterangan, baris
+
+def buat_penyesuaian(tahun=3, tahun_mulai=2022, seed=1):
+    """
+    Jurnal penyesuaian akhir bulan: (no, tanggal, keterangan, ref, debit sen, kredit sen, is_indent)
+    """
+    acak = random.Random(seed + 1)
+    for bulan in range(tahun * 12):
+        th, bl = divmod(bulan, 12)
+        akhir = datetime.date(tahun_mulai + th, bl + 1, 1) + datetime.timedelta(days=31)
+        tanggal = (akhir.replace(day=1) - datetime.timedelta(days=1)).isoformat()
+
+        daftar = [(no, "6-1300", kredit, bagi_sen(ke_sen(SALDO_AWAL[aset]), umur))
+                  for no, (aset, kredit, umur) in enumerate(PENYUSUTAN, 1)]
+        daftar += [
+            (4, "5-1110", "1-1410", ke_sen(acak.randrange(2000, 9000) * 1000)),
+            (5, "5-1120", "1-1420", ke_sen(acak.randrange(1000, 6000) * 1000)),
+            (6, "6-1410", "5-1310", ke_sen(acak.randrange(500, 3000) * 1000)),
+            (7, "6-1420", "5-1320", ke_sen(acak.randrange(300, 2000) * 1000)),
+        ]
+        for no, debit, kredit, sen in daftar:
+            yield (no, tanggal, AKUN_PER_KODE[debit]["nama"], debit, sen, 0, 0)
+            yield (no, tanggal, AKUN_PER_KODE[kredit]["nama"], kredit, 0, sen, 1)
+
+def muat(path, jumlah_baris, tahun=3, tahun_mulai=2022, seed=1, porsi_tetangga=0.1):
+    """
+    Buat file SQLite berisi ledger USER_UTAMA (jumlah_baris baris jurnal umum)
+    dan USER_TETANGGA (porsi_tetangga dari itu). Semua dimuat dalam satu
+    transaksi per user; trigger mengisi account_balances dan ledger_versions.
+    Return ringkasan jumlah data.
+    """
+    db = PenyimpananSQLite(path)
+    conn = db.conn
+    ringkasan = {}
+    for user, baris_user, seed_user in ((USER_UTAMA, jumlah_baris, seed),
+                                        (USER_TETANGGA, int(jumlah_baris * porsi_tetangga), seed + 100)):
+        if baris_user < 2:
+            continue
+        jumlah_jurnal = jumlah_baris_umum = 0
+        with conn:
+            conn.executemany(
+                "insert into opening_balance (user_email, account_code, account_name, debit, credit) values (?, ?, ?, ?, ?)",
+                [(user, kode, AKUN_PER_KODE[kode]["nama"], ke_sen(n), 0) for kode, n in SALDO_AWAL.items()]
+                + [(user, "3-1100", AKUN_PER_KODE["3-1100"]["nama"], 0, ke_sen(sum(SALDO_AWAL.values())))]
+            )
+            for tanggal, keterangan, baris in buat_jurnal(baris_user, tahun, tahun_mulai, seed_user):
+                entry_id = conn.execute(
+                    "insert into general_journal (user_email, date, description) values (?, ?, ?)",
+                    (user, tanggal, keterangan)
+                ).lastrowid
+                conn.executemany(
+                    "insert into journal_lines (journal_id, user_email, date, line_no, account_code, account_name, debit, credit)"
+                    " values (?, ?, ?, ?, ?, ?, ?, ?)",
+                    [(entry_id, user, tanggal, no, *b) for no, b in enumerate(baris, 1)]
+                )
+                jumlah_jurnal += 1
+                jumlah_baris_umum += len(baris)
+            penyesuaian = [(user, *p) for p in buat_penyesuaian(tahun, tahun_mulai, seed_user)]
+            conn.executemany(
+                "insert into adjustment_journal (user_email, no, date, description, ref, debit, credit, is_indent)"
+                " values (?, ?, ?, ?, ?, ?, ?, ?)", penyesuaian
+            )
+        ringkasan[user] = {"jurnal": jumlah_jurnal, "baris_jurnal": jumlah_baris_umum,
+                           "baris_penyesuaian": len(penyesuaian), "saldo_awal": len(SALDO_AWAL) + 1}
+    conn.execute("analyze")
+    return ringkasan
+
+def main():
+    parser = argparse.ArgumentParser(description="Buat ledger sintetis peternakan belut (SQLite)")
+    parser.add_argument("--baris", type=int, default=10000, help="jumlah baris jurnal umum user utama")
+    parser.add_argument("--tahun", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--keluaran", required=True, help="path file SQLite (ditimpa)")
+    args = parser.parse_args()
+
+    for akhiran in ("", "-wal", "-shm"):
+        if os.path.exists(args.keluaran + akhiran):
+            os.remove(args.keluaran + akhiran)
+    mulai = time.perf_counter()
+    ringkasan = muat(args.keluaran, args.baris, args.tahun, seed=args.seed)
+    print(f"{args.keluaran}: {ringkasan} ({time.perf_counter() - mulai:.1f} detik)")
+
+if __name__ == "__main__":
+    main()
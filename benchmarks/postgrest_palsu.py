@@ -0,0 +1,503 @@
+# ---------------------------
+# POSTGREST PALSU (IN-PROCESS)
+# ---------------------------
+# Transport httpx untuk client supabase-py yang menjawab request PostgREST
+# langsung di proses yang sama, dari database SQLite (skema & trigger sama
+# dengan penyimpanan/db_sqlite.py). Dipakai untuk menjalankan semua route
+# belut_in_app.py lewat PenyimpananSupabase tanpa jaringan dan tanpa server
+# Supabase, dengan latensi jaringan yang bisa diatur.
+#
+# Subset PostgREST yang didukung (yang dipakai aplikasi):
+# - GET tabel: select (kolom, alias, embed journal_lines(...) termasuk !inner),
+#   filter eq/neq/gt/gte/lt/lte/like/ilike/match/imatch/in/is, or=(...), order, limit,
+#   offset, header Range, Prefer count=exact (Content-Range)
+# - POST tabel (insert satu/banyak baris), DELETE tabel dengan filter
+# - POST rpc/simpan_jurnal, rpc/rekap_saldo_akun
+# Nominal dikirim/diterima dalam rupiah seperti numeric(18,2) di Postgres, dan
+# ditolak/dijawab dengan error JSON PostgREST jika tabel/kolom tidak dikenal.
+#
+# Contoh:
+#   transport = TransportPostgREST(latensi=0.03, jitter=0.01)
+#   b.penyimpanan.client = buat_client_palsu(transport)
+#   ... jalankan route ...
+#   transport.ringkasan()   # {(tabel, metode): jumlah request}
+#
+# Jalankan dari root repo untuk mencoba semua halaman dengan latensi 30 ms:
+#   python benchmarks/postgrest_palsu.py --latensi 30
+import argparse, json, os, random, re, sqlite3, sys, tempfile, threading, time
+from collections import Counter
+
+import httpx
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "extensions"))
+from uang import ke_sen, sen_ke_angka
+from penyimpanan.db_sqlite import PenyimpananSQLite
+
+URL_PALSU = "http://postgrest.palsu"
+# Bentuknya JWT (diperiksa create_client), isinya tidak dipakai
+KUNCI_PALSU = "eyJhbGciOiJIUzI1NiJ9.eyJyb2xlIjoiYW5vbiJ9.palsu"
+
+# Kolom uang disimpan sebagai sen di SQLite
+KOLOM_UANG = {"debit", "credit", "amount", "total_debit", "total_kredit"}
+KOLOM_BOOLEAN = {"is_indent"}
+KOLOM_JSON = {"lines"}
+
+# Relasi embed: (tabel induk, tabel anak) -> kolom foreign key di tabel anak
+RELASI = {("general_journal", "journal_lines"): "journal_id"}
+
+OPERATOR = {"eq": "=", "neq": "<>", "gt": ">", "gte": ">=", "lt": "<", "lte": "<=", "like": "like", "ilike": "like",
+            "match": "regexp", "imatch": "iregexp"}
+
+def _cocok_regex(pola, nilai, flags=0):
+    return nilai is not None and re.search(pola, nilai, flags) is not None
+
+class SQLiteRegex(PenyimpananSQLite):
+    """
+    PenyimpananSQLite dengan fungsi regexp/iregexp untuk filter match/imatch
+    (~ dan ~* di Postgres)
+    """
+
+    def _buka(self):
+        conn = super()._buka()
+        conn.create_function("regexp", 2, _cocok_regex, deterministic=True)
+        conn.create_function("iregexp", 2, lambda pola, nilai: _cocok_regex(pola, nilai, re.IGNORECASE), deterministic=True)
+        return conn
+
+class KesalahanPostgREST(Exception):
+    """
+    Error yang dijawab sebagai JSON error PostgREST (message, code, details, hint)
+    """
+
+    def __init__(self, status, code, message):
+        super().__init__(message)
+        self.status = status
+        self.isi = {"code": code, "message": message, "details": None, "hint": None}
+
+def pisah_atas(teks, pemisah=","):
+    """
+    Pisah teks di pemisah yang tidak berada di dalam tanda kurung
+    """
+    bagian, kedalaman, awal = [], 0, 0
+    for i, c in enumerate(teks):
+        if c == "(":
+            kedalaman += 1
+        elif c == ")":
+            kedalaman -= 1
+        elif c == pemisah and kedalaman == 0:
+            bagian.append(teks[awal:i])
+            awal = i + 1
+    bagian.append(teks[awal:])
+    return [b.strip() for b in bagian if b.strip()]
+
+class TransportPostgREST(httpx.BaseTransport):
+    """
+    path      : file SQLite (default: file sementara yang dihapus bersama objek)
+    latensi   : detik per round-trip (ditambah jitter acak +- jitter)
+    per_baris : detik tambahan per baris yang dikirim (biaya transfer/parsing)
+    maks_baris: batas baris per response seperti max-rows PostgREST
+    tanpa_tabel: nama tabel yang dianggap belum dibuat migrasinya (uji fallback)
+    """
+
+    def __init__(self, path=None, latensi=0.0, jitter=0.0, per_baris=0.0, maks_baris=1000, tanpa_tabel=(), seed=0):
+        if path is None:
+            self._tmp = tempfile.TemporaryDirectory(prefix="postgrest-palsu-")
+            path = os.path.join(self._tmp.name, "postgrest_palsu.db")
+        self.db = SQLiteRegex(path)
+        self.latensi = latensi
+        self.jitter = jitter
+        self.per_baris = per_baris
+        self.maks_baris = maks_baris
+        self.tanpa_tabel = set(tanpa_tabel)
+        self._acak = random.Random(seed)
+        self._kunci = threading.Lock()
+        self._kolom = {}
+        self.catatan = []
+
+    # ---- Statistik ----
+    def ringkasan(self):
+        """Jumlah request per (tabel, metode) sejak reset()"""
+        with self._kunci:
+            return Counter((c["tabel"], c["metode"]) for c in self.catatan)
+
+    def reset(self):
+        with self._kunci:
+            self.catatan = []
+
+    # ---- httpx ----
+    def handle_request(self, request):
+        mulai = time.perf_counter()
+        path = request.url.path
+        tabel = path.split("/rest/v1/", 1)[-1].strip("/")
+        status, data, headers = 200, [], {}
+        try:
+            status, data, headers = self._jawab(request, tabel)
+        except KesalahanPostgREST as e:
+            status, data = e.status, e.isi
+        except (sqlite3.Error, ValueError) as e:
+            status, data = 400, KesalahanPostgREST(400, "22000", str(e)).isi
+
+        baris = len(data) if isinstance(data, list) else 1
+        tunda = self.latensi + self.per_baris * baris
+        if self.jitter:
+            with self._kunci:
+                tunda += self._acak.uniform(-self.jitter, self.jitter)
+        if tunda > 0:
+            time.sleep(tunda)
+
+        with self._kunci:
+            self.catatan.append({
+                "tabel": tabel, "metode": request.method, "status": status,
+                "baris": baris, "detik": time.perf_counter() - mulai,
+            })
+        # numeric dikirim PostgREST sebagai angka JSON (pecahan sen dari dari_db = Decimal)
+        headers["Content-Type"] = "application/json; charset=utf-8"
+        return httpx.Response(status, headers=headers, content=json.dumps(data, default=float).encode())
+
+    def _jawab(self, request, tabel):
+        if tabel.startswith("rpc/"):
+            return self._rpc(tabel[4:], json.loads(request.content or b"{}"))
+        self._cek_tabel(tabel)
+        if request.method == "GET":
+            return self._select(request, tabel)
+        if request.method == "POST":
+            return self._insert(request, tabel)
+        if request.method == "DELETE":
+            return self._delete(request, tabel)
+        raise KesalahanPostgREST(405, "PGRST117", f"Unsupported HTTP method: {request.method}")
+
+    # ---- Skema ----
+    def _cek_tabel(self, tabel):
+        if tabel in self.tanpa_tabel or not self.kolom(tabel):
+            raise KesalahanPostgREST(404, "42P01", f'relation "public.{tabel}" does not exist')
+
+    def kolom(self, tabel):
+        """Nama kolom tabel (kosong jika tabel tidak ada)"""
+        if tabel not in self._kolom:
+            self._kolom[tabel] = [r["name"] for r in self.db.conn.execute(f'pragma table_info("{tabel}")')]
+        return self._kolom[tabel]
+
+    def _cek_kolom(self, tabel, kolom):
+        if kolom not in self.kolom(tabel):
+            raise KesalahanPostgREST(400, "42703", f"column {tabel}.{kolom} does not exist")
+        return kolom
+
+    # ---- Konversi nilai ----
+    @staticmethod
+    def ke_db(kolom, nilai):
+        if nilai is None:
+            return None
+        if kolom in KOLOM_UANG:
+            return ke_sen(nilai)
+        if kolom in KOLOM_BOOLEAN:
+            return 1 if nilai in (True, "true") else 0
+        if kolom in KOLOM_JSON and not isinstance(nilai, str):
+            return json.dumps(nilai)
+        return nilai
+
+    @staticmethod
+    def dari_db(row):
+        row = dict(row)
+        for k, v in row.items():
+            if v is None:
+                continue
+            if k in KOLOM_UANG:
+                row[k] = sen_ke_angka(v)
+            elif k in KOLOM_BOOLEAN:
+                row[k] = bool(v)
+            elif k in KOLOM_JSON:
+                row[k] = json.loads(v)
+        return row
+
+    # ---- Filter ----
+    def _kondisi(self, tabel, alias, kolom, opval):
+        """
+        Satu filter PostgREST (kolom=op.nilai) -> (sql, params)
+        """
+        self._cek_kolom(tabel, kolom)
+        negasi = opval.startswith("not.")
+        if negasi:
+            opval = opval[4:]
+        op, _, nilai = opval.partition(".")
+        ref = f'{alias}."{kolom}"'
+        if op in OPERATOR:
+            if op in ("like", "ilike"):
+                # Seperti Postgres: \ meng-escape %, _ dan \ itu sendiri
+                sql, params = f"{ref} like ? escape '\\'", [nilai.replace("*", "%")]
+            elif op in ("match", "imatch"):
+                sql, params = f"{OPERATOR[op]}(?, {ref})", [nilai]
+            else:
+                sql, params = f"{ref} {OPERATOR[op]} ?", [self.ke_db(kolom, nilai)]
+        elif op == "in":
+            isi = [v.strip().strip('"') for v in nilai.strip("()").split(",") if v.strip()]
+            sql, params = f"{ref} in ({','.join('?' * len(isi))})", [self.ke_db(kolom, v) for v in isi]
+        elif op == "is":
+            nilai_is = {"null": "null", "true": "1", "false": "0"}.get(nilai)
+            if nilai_is is None:
+                raise KesalahanPostgREST(400, "PGRST100", f"failed to parse filter (is.{nilai})")
+            sql, params = f"{ref} is {nilai_is}", []
+        else:
+            raise KesalahanPostgREST(400, "PGRST100", f"failed to parse filter ({opval})")
+        return (f"not ({sql})" if negasi else sql), params
+
+    def _logika(self, tabel, alias, gabung, isi):
+        """
+        Filter or=(...)/and=(...), boleh bersarang: a.eq.1,and(b.gt.2,c.lt.3)
+        """
+        bagian, params = [], []
+        for syarat in pisah_atas(isi.strip()[1:-1]):
+            for kata in ("and", "or"):
+                if syarat.startswith(kata + "("):
+                    sql, p = self._logika(tabel, alias, kata, syarat[len(kata):])
+                    break
+            else:
+                kolom, _, opval = syarat.partition(".")
+                sql, p = self._kondisi(tabel, alias, kolom, opval)
+            bagian.append(f"({sql})")
+            params.extend(p)
+        return f" {gabung} ".join(bagian) or "1", params
+
+    # ---- GET ----
+    def _parse_select(self, tabel, teks):
+        """
+        select=kolom,alias:anak!inner(kolom,...) -> (kolom, daftar embed)
+        """
+        kolom, embed = [], []
+        for item in pisah_atas("".join(teks.split())):
+            if "(" in item:
+                kepala, isi = item[:-1].split("(", 1)
+                alias, _, nama = kepala.rpartition(":")
+                nama, _, petunjuk = nama.partition("!")
+                if (tabel, nama) not in RELASI:
+                    raise KesalahanPostgREST(400, "PGRST200", f"Could not find a relationship between '{tabel}' and '{nama}'")
+                self._cek_tabel(nama)
+                embed.append({
+                    "alias": alias or nama, "tabel": nama, "inner": petunjuk == "inner",
+                    "fk": RELASI[(tabel, nama)], "kolom": self._parse_select(nama, isi)[0],
+                    "where": [], "params": [],
+                })
+            else:
+                alias, _, nama = item.rpartition(":")
+                if nama != "*":
+                    self._cek_kolom(tabel, nama)
+                kolom.append((alias or nama, nama))
+        return kolom, embed
+
+    @staticmethod
+    def _proyeksi(row, kolom):
+        if not kolom or kolom == [("*", "*")]:
+            return dict(row)
+        hasil = {}
+        for alias, nama in kolom:
+            if nama == "*":
+                hasil.update(row)
+            else:
+                hasil[alias] = row[nama]
+        return hasil
+
+    def _select(self, request, tabel):
+        params_url = request.url.params
+        kolom, embed = self._parse_select(tabel, params_url.get("select", "*"))
+        per_alias = {e["alias"]: e for e in embed}
+
+        where, params, order = [], [], []
+        limit = offset = None
+        for key, nilai in params_url.multi_items():
+            if key == "select":
+                continue
+            if key == "order":
+                for bagian in nilai.split(","):
+                    nama, *opsi = bagian.split(".")
+                    arah = "desc" if "desc" in opsi else "asc"
+                    nulls = "first" if "nullsfirst" in opsi or ("desc" in opsi and "nullslast" not in opsi) else "last"
+                    order.append(f't."{self._cek_kolom(tabel, nama)}" {arah} nulls {nulls}')
+            elif key == "limit":
+                limit = int(nilai)
+            elif key == "offset":
+                offset = int(nilai)
+            elif key in ("or", "and"):
+                sql, p = self._logika(tabel, "t", key, nilai)
+                where.append(f"({sql})")
+                params.extend(p)
+            elif "." in key:
+                alias, _, nama = key.partition(".")
+                if alias not in per_alias:
+                    raise KesalahanPostgREST(400, "PGRST108", f"'{alias}' is not an embedded resource in this request")
+                e = per_alias[alias]
+                sql, p = self._kondisi(e["tabel"], "e", nama, nilai)
+                e["where"].append(sql)
+                e["params"].extend(p)
+            else:
+                sql, p = self._kondisi(tabel, "t", key, nilai)
+                where.append(sql)
+                params.extend(p)
+
+        # Embed !inner: induk hanya ikut jika punya baris anak yang lolos filter
+        for e in embed:
+            if e["inner"]:
+                syarat = " and ".join([f'e."{e["fk"]}" = t.id'] + e["where"])
+                where.append(f'exists (select 1 from "{e["tabel"]}" e where {syarat})')
+                params.extend(e["params"])
+
+        # Range header lalu limit/offset, dibatasi max-rows
+        awal, batas = offset or 0, self.maks_baris
+        rentang = request.headers.get("range")
+        if rentang:
+            a, _, b = rentang.partition("-")
+            awal = int(a)
+            if b:
+                batas = min(batas, int(b) - int(a) + 1)
+        if limit is not None:
+            batas = min(batas, limit)
+
+        sql_where = " and ".join(where) or "1"
+        sql = f'select t.* from "{tabel}" t where {sql_where}'
+        if order:
+            sql += " order by " + ", ".join(order)
+        rows = [self.dari_db(r) for r in self.db.conn.execute(sql + " limit ? offset ?", params + [batas, awal])]
+
+        total = "*"
+        if "count=exact" in request.headers.get("prefer", ""):
+            total = self.db.conn.execute(f'select count(*) from "{tabel}" t where {sql_where}', params).fetchone()[0]
+
+        for e in embed:
+            anak = {}
+            ids = [r["id"] for r in rows]
+            for i in range(0, len(ids), 500):
+                bagian = ids[i:i + 500]
+                syarat = " and ".join([f'e."{e["fk"]}" in ({",".join("?" * len(bagian))})'] + e["where"])
+                for r in self.db.conn.execute(f'select e.* from "{e["tabel"]}" e where {syarat} order by e.id', bagian + e["params"]):
+                    anak.setdefault(r[e["fk"]], []).append(self._proyeksi(self.dari_db(r), e["kolom"]))
+            for r in rows:
+                r[e["alias"]] = anak.get(r["id"], [])
+
+        data = [
+            dict(self._proyeksi(r, kolom), **{e["alias"]: r[e["alias"]] for e in embed})
+            for r in rows
+        ]
+        if data:
+            content_range = f"{awal}-{awal + len(data) - 1}/{total}"
+        else:
+            content_range = f"*/{total}"
+        return 200, data, {"Content-Range": content_range}
+
+    # ---- POST / DELETE ----
+    def _insert(self, request, tabel):
+        isi = json.loads(request.content or b"[]")
+        rows = isi if isinstance(isi, list) else [isi]
+        hasil = []
+        with self.db.conn as conn:
+            for row in rows:
+                kolom = [self._cek_kolom(tabel, k) for k in row]
+                sql = (f'insert into "{tabel}" ({",".join(f"{chr(34)}{k}{chr(34)}" for k in kolom)})'
+                       f' values ({",".join("?" * len(kolom))}) returning *')
+                hasil.extend(conn.execute(sql, [self.ke_db(k, row[k]) for k in kolom]).fetchall())
+        data = [self.dari_db(r) for r in hasil]
+        return 201, (data if "return=representation" in request.headers.get("prefer", "") else []), {}
+
+    def _delete(self, request, tabel):
+        where, params = [], []
+        for key, nilai in request.url.params.multi_items():
+            if key in ("or", "and"):
+                sql, p = self._logika(tabel, "t", key, nilai)
+            else:
+                sql, p = self._kondisi(tabel, "t", key, nilai)
+            where.append(sql)
+            params.extend(p)
+        with self.db.conn as conn:
+            hasil = conn.execute(f'delete from "{tabel}" as t where {" and ".join(where) or "1"} returning *', params).fetchall()
+        data = [self.dari_db(r) for r in hasil]
+        return 200, (data if "return=representation" in request.headers.get("prefer", "") else []), {}
+
+    # ---- RPC ----
+    def _rpc(self, fungsi, p):
+        if fungsi not in ("simpan_jurnal", "rekap_saldo_akun") or fungsi in self.tanpa_tabel:
+            raise KesalahanPostgREST(404, "PGRST202", f"Could not find the function public.{fungsi} in the schema cache")
+        if fungsi == "rekap_saldo_akun":
+            # returns table: baris account_balances user, urut (account_code, stage)
+            rows = self.db.conn.execute(
+                "select account_code, account_name, stage, total_debit, total_kredit from account_balances"
+                " where user_email = ? order by account_code, stage", (p["p_user_email"],)
+            ).fetchall()
+            return 200, [self.dari_db(r) for r in rows], {}
+        # Sama dengan fungsi Postgres: returns bigint, dijawab sebagai angka JSON
+        return 200, self.db.simpan_jurnal(p["p_user_email"], p["p_date"], p["p_description"], p["p_lines"]), {}
+
+def buat_client_palsu(transport):
+    """
+    Client supabase-py yang semua request PostgREST-nya dijawab transport
+    """
+    from supabase import create_client
+    from postgrest.utils import SyncClient
+
+    client = create_client(URL_PALSU, KUNCI_PALSU)
+    lama = client.postgrest.session
+    client.postgrest.session = SyncClient(
+        base_url=lama.base_url, headers=lama.headers, timeout=lama.timeout, transport=transport
+    )
+    lama.close()
+    return client
+
+# ---------------------------
+# COBA SEMUA HALAMAN
+# ---------------------------
+ROUTE_GET = [
+    "/dashboard", "/saldo_awal", "/jurnal", "/histori", "/neraca_saldo", "/laporan_laba_rugi",
+    "/laporan_perubahan_modal", "/laporan_posisi_keuangan", "/laporan_arus_kas",
+    "/jurnal_penyesuaian/view", "/neraca_saldo_setelah_penyesuaian", "/buku_besar",
+    "/jurnal_penutup", "/neraca_saldo_penutup",
+]
+
+def muat_aplikasi(transport):
+    """
+    Import belut_in_app dengan backend supabase yang request-nya dijawab transport
+    """
+    os.environ["STORAGE_BACKEND"] = "supabase"
+    os.environ["SUPABASE_URL"] = URL_PALSU
+    os.environ["SUPABASE_KEY"] = KUNCI_PALSU
+    os.environ.setdefault("SECRET_KEY", "postgrest-palsu")
+    import belut_in_app
+    belut_in_app.penyimpanan.client = buat_client_palsu(transport)
+    return belut_in_app
+
+def isi_contoh(client):
+    """Beberapa transaksi lewat form aplikasi (insert, rpc simpan_jurnal)"""
+    form = [
+        ("/saldo_awal", {"kode": "1-1100", "debit": "10000000", "kredit": "0"}),
+        ("/saldo_awal", {"kode": "3-1100", "debit": "0", "kredit": "10000000"}),
+        ("/transaksi/penjualan", {"akun": "4-1110", "tanggal": "2025-01-05", "metode": "Tunai", "kuantitas": "3"}),
+        ("/transaksi/penjualan", {"akun": "4-1120", "tanggal": "2025-01-06", "metode": "Transfer", "kuantitas": "2.5"}),
+        ("/transaksi/pembelian", {"akun": "5-1310", "tanggal": "2025-01-03", "metode": "Tunai", "nominal": "200000"}),
+        ("/transaksi/lainnya", {"akun_debit": "3-1200", "akun_kredit": "1-1100", "tanggal": "2025-01-09",
+                                "nominal": "50000", "keterangan": "prive"}),
+        ("/jurnal_penyesuaian/input", {"jurnal_type": "penyusutan_bangunan", "tanggal": "2025-01-31",
+                                       "harga_bangunan": "5000000"}),
+    ]
+    for url, data in form:
+        res = client.post(url, data=data)
+        assert res.status_code in (200, 302), (url, res.status_code)
+
+def main():
+    parser = argparse.ArgumentParser(description="Jalankan semua halaman lewat PostgREST palsu")
+    parser.add_argument("--latensi", type=float, default=30, help="ms per round-trip")
+    parser.add_argument("--jitter", type=float, default=5, help="ms, acak +- per round-trip")
+    args = parser.parse_args()
+
+    transport = TransportPostgREST(latensi=args.latensi / 1000, jitter=args.jitter / 1000)
+    app = muat_aplikasi(transport).app
+    client = app.test_client()
+    with client.session_transaction() as s:
+        s["user_email"] = "peternak@contoh.id"
+    isi_contoh(client)
+
+    print(f"{'route':<38}{'status':>7}{'query':>7}{'ms':>9}")
+    for route in ROUTE_GET:
+        transport.reset()
+        mulai = time.perf_counter()
+        res = client.get(route)
+        res.get_data()
+        ms = (time.perf_counter() - mulai) * 1000
+        print(f"{route:<38}{res.status_code:>7}{sum(transport.ringkasan().values()):>7}{ms:>9.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+# ---------------------------
+# DAFTAR AKUN (CHART OF ACCOUNTS)
+# ---------------------------
+# Semua index di bawah dibangun satu kali saat modul di-import, sehingga
+# pencarian akun per kode/nama/kategori tidak lagi menyisir DAFTAR_AKUN.
+
+DAFTAR_AKUN = [
+    # ASET LANCAR
+    {"kode": "1-1100", "nama": "Kas", "kategori": "Aset"},
+    {"kode": "1-1110", "nama": "Kas di Bank", "kategori": "Aset"},
+    {"kode": "1-1200", "nama": "Piutang Dagang", "kategori": "Aset"},
+    {"kode": "1-1310", "nama": "Persediaan Bibit Belut Standar", "kategori": "Aset"},
+    {"kode": "1-1320", "nama": "Persediaan Bibit Belut Super", "kategori": "Aset"},
+    {"kode": "1-1410", "nama": "Persediaan Belut Standar", "kategori": "Aset"},
+    {"kode": "1-1420", "nama": "Persediaan Belut Super", "kategori": "Aset"},
+    {"kode": "1-1510", "nama": "Persediaan Pakan Belut Standar", "kategori": "Aset"},
+    {"kode": "1-1520", "nama": "Persediaan Pakan Belut Super", "kategori": "Aset"},
+    {"kode": "1-1600", "nama": "Perlengkapan", "kategori": "Aset"},
+    
+    # ASET TETAP
+    {"kode": "1-2100", "nama": "Tanah", "kategori": "Aset"},
+    {"kode": "1-2200", "nama": "Bangunan", "kategori": "Aset"},
+    {"kode": "1-2210", "nama": "Akumulasi Penyusutan Bangunan", "kategori": "Aset"},
+    {"kode": "1-2300", "nama": "Kendaraan", "kategori": "Aset"},
+    {"kode": "1-2310", "nama": "Akumulasi Penyusutan Kendaraan", "kategori": "Aset"},
+    {"kode": "1-2400", "nama": "Peralatan", "kategori": "Aset"},
+    {"kode": "1-2410", "nama": "Akumulasi Penyusutan Peralatan", "kategori": "Aset"},
+    
+    # LIABILITAS
+    {"kode": "2-1100", "nama": "Utang Dagang", "kategori": "Liabilitas"},
+    {"kode": "2-1200", "nama": "Utang Biaya", "kategori": "Liabilitas"},
+    {"kode": "2-2100", "nama": "Pinjaman Bank BCA", "kategori": "Liabilitas"},
+    
+    # EKUITAS
+    {"kode": "3-1100", "nama": "Modal Pemilik", "kategori": "Ekuitas"},
+    {"kode": "3-1200", "nama": "Prive", "kategori": "Ekuitas"},
+    {"kode": "3-1300", "nama": "Ikhtisar Laba Rugi", "kategori": "Ekuitas"},
+    
+    # PENDAPATAN
+    {"kode": "4-1110", "nama": "Penjualan Belut Standar", "kategori": "Pendapatan"},
+    {"kode": "4-1120", "nama": "Penjualan Belut Super", "kategori": "Pendapatan"},
+    
+    # HARGA POKOK PENJUALAN
+    {"kode": "5-1110", "nama": "Harga Pokok Penjualan Belut Standar", "kategori": "HPP"},
+    {"kode": "5-1120", "nama": "Harga Pokok Penjualan Belut Super", "kategori": "HPP"},
+    
+    # PEMBELIAN
+    {"kode": "5-1210", "nama": "Pembelian Bibit Belut Standar", "kategori": "Pembelian"},
+    {"kode": "5-1220", "nama": "Pembelian Bibit Belut Super", "kategori": "Pembelian"},
+    {"kode": "5-1310", "nama": "Pembelian Pakan Belut Standar", "kategori": "Pembelian"},
+    {"kode": "5-1320", "nama": "Pembelian Pakan Belut Super", "kategori": "Pembelian"},
+    
+    # BEBAN OPERASIONAL
+    {"kode": "6-1100", "nama": "Beban Listrik dan Air", "kategori": "Beban"},
+    {"kode": "6-1200", "nama": "Beban Perlengkapan", "kategori": "Beban"},
+    {"kode": "6-1300", "nama": "Beban Depresiasi", "kategori": "Beban"},
+    {"kode": "6-1410", "nama": "Beban Pakan Belut Standar", "kategori": "Beban"},
+    {"kode": "6-1420", "nama": "Beban Pakan Belut Super", "kategori": "Beban"},
+    {"kode": "6-1500", "nama": "Beban Lain-Lain", "kategori": "Beban"},
+    
+    # PENDAPATAN LAIN-LAIN
+    {"kode": "8-1100", "nama": "Pendapatan Bunga", "kategori": "Pendapatan Lain"},
+    {"kode": "8-1200", "nama": "Pendapatan Denda", "kategori": "Pendapatan Lain"},
+    {"kode": "8-1300", "nama": "Pendapatan Lain-Lain", "kategori": "Pendapatan Lain"},
+    
+    # BEBAN LAIN-LAIN
+    {"kode": "9-1100", "nama": "Beban Bunga", "kategori": "Beban Lain"},
+    {"kode": "9-1200", "nama": "Beban Administrasi Bank", "kategori": "Beban Lain"},
+    {"kode": "9-1300", "nama": "Beban Denda", "kategori": "Beban Lain"}
+]
+
+# Kelompok akun di laporan keuangan berdasarkan prefix kode
+KATEGORI_LAPORAN = {
+    "aset_lancar": "1-1",
+    "aset_tetap": "1-2",
+    "kewajiban_lancar": "2-1",
+    "kewajiban_panjang": "2-2",
+    "ekuitas": "3-",
+    "pendapatan": "4-",
+    "hpp": "5-",
+    "beban": "6-",
+    "pendapatan_lain": "8-",
+    "beban_lain": "9-",
+}
+
+# ---------------------------
+# INDEX
+# ---------------------------
+AKUN_PER_KODE = {a["kode"]: a for a in DAFTAR_AKUN}
+AKUN_PER_NAMA = {a["nama"]: a for a in DAFTAR_AKUN}
+
+AKUN_PER_KATEGORI = {}
+for _a in DAFTAR_AKUN:
+    AKUN_PER_KATEGORI.setdefault(_a["kategori"], []).append(_a)
+
+_KATEGORI_PER_PREFIX = {prefix: nama for nama, prefix in KATEGORI_LAPORAN.items()}
+
+def kategori_laporan(kode):
+    """
+    Kelompok laporan untuk satu kode akun ('aset_lancar', 'pendapatan', ...),
+    None jika kode tidak masuk kelompok mana pun
+    """
+    kode = kode or ""
+    return _KATEGORI_PER_PREFIX.get(kode[:3]) or _KATEGORI_PER_PREFIX.get(kode[:2])
+
+AKUN_PER_PREFIX = {prefix: [] for prefix in KATEGORI_LAPORAN.values()}
+for _a in DAFTAR_AKUN:
+    _kategori = kategori_laporan(_a["kode"])
+    if _kategori:
+        AKUN_PER_PREFIX[KATEGORI_LAPORAN[_kategori]].append(_a)
+del _a, _kategori
+
+def cari_nama_akun(kode, default=None):
+    """
+    Nama akun dari DAFTAR_AKUN; jika kode tidak terdaftar kembalikan default
+    (atau kode itu sendiri)
+    """
+    akun = AKUN_PER_KODE.get(kode)
+    if akun:
+        return akun["nama"]
+    return default if default is not None else kode
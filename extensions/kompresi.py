@@ -0,0 +1,180 @@
+# ---------------------------
+# KOMPRESI RESPONS (WSGI MIDDLEWARE)
+# ---------------------------
+# Respons teks (HTML laporan, CSS, JSON) dikompres gzip, atau brotli jika
+# paket brotli terpasang dan browser mendukungnya. Paket brotli opsional (tidak
+# ada di requirements.txt, pasang dengan pip install brotli). Respons kecil (di
+# bawah ukuran minimum) dikirim apa adanya karena kompresi tidak sebanding biayanya.
+# Halaman streaming tetap dikirim bertahap: setiap potongan di-flush ke client
+# setelah dikompres.
+import zlib
+from werkzeug.http import parse_accept_header
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+TIPE_TEKS = {
+    "text/html", "text/css", "text/plain", "text/csv", "text/javascript",
+    "application/javascript", "application/json", "image/svg+xml",
+}
+
+ENCODING_TERSEDIA = ("br", "gzip") if brotli else ("gzip",)
+
+def pilih_encoding(accept_encoding, tersedia=ENCODING_TERSEDIA):
+    """
+    Encoding terbaik dari header Accept-Encoding di antara yang tersedia
+    (urutan tersedia = prioritas server), None jika tidak ada yang diterima
+    """
+    if not accept_encoding:
+        return None
+    return parse_accept_header(accept_encoding).best_match(tersedia)
+
+def kompres_sekaligus(data, encoding):
+    """
+    Kompres data utuh dengan level tertinggi (untuk aset statis yang dikompres sekali)
+    """
+    if encoding == "br":
+        return brotli.compress(data, quality=11)
+    return zlib.compress(data, 9, wbits=31)
+
+class _KompresorGzip:
+    def __init__(self, level):
+        self._z = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def kompres(self, data):
+        return self._z.compress(data) + self._z.flush(zlib.Z_SYNC_FLUSH)
+
+    def selesai(self):
+        return self._z.flush()
+
+class _KompresorBrotli:
+    def __init__(self, kualitas):
+        self._b = brotli.Compressor(quality=kualitas)
+
+    def kompres(self, data):
+        return self._b.process(data) + self._b.flush()
+
+    def selesai(self):
+        return self._b.finish()
+
+def _header(headers, nama):
+    nama = nama.lower()
+    for k, v in headers:
+        if k.lower() == nama:
+            return v
+    return None
+
+def _tambah_vary(headers, nilai):
+    for i, (k, v) in enumerate(headers):
+        if k.lower() == "vary":
+            if nilai.lower() not in [x.strip().lower() for x in v.split(",")]:
+                headers[i] = (k, f"{v}, {nilai}")
+            return headers
+    headers.append(("Vary", nilai))
+    return headers
+
+class KompresiRespons:
+    """
+    Middleware WSGI: app.wsgi_app = KompresiRespons(app.wsgi_app)
+    """
+    def __init__(self, app, ukuran_minimum=1024, level_gzip=6, kualitas_brotli=5):
+        self.app = app
+        self.ukuran_minimum = ukuran_minimum
+        self.level_gzip = level_gzip
+        self.kualitas_brotli = kualitas_brotli
+
+    def _kompresor(self, encoding):
+        if encoding == "br":
+            return _KompresorBrotli(self.kualitas_brotli)
+        return _KompresorGzip(self.level_gzip)
+
+    def __call__(self, environ, start_response):
+        encoding = None
+        if environ.get("REQUEST_METHOD") != "HEAD":
+            encoding = pilih_encoding(environ.get("HTTP_ACCEPT_ENCODING"))
+
+        respons = {}
+        def tangkap(status, headers, exc_info=None):
+            if exc_info and respons.get("terkirim"):
+                raise exc_info[1].with_traceback(exc_info[2])
+            respons["status"], respons["headers"] = status, list(headers)
+            return respons.setdefault("tulis", []).append
+
+        body = self.app(environ, tangkap)
+        if "status" in respons and not respons.get("tulis") and not self._perlu_kompres(respons, encoding):
+            # Jalur cepat: body diteruskan apa adanya (termasuk wsgi.file_wrapper)
+            start_response(respons["status"], self._header_tanpa_kompres(respons))
+            respons["terkirim"] = True
+            return body
+        return self._alirkan(body, respons, start_response, encoding)
+
+    def _perlu_kompres(self, respons, encoding):
+        headers = respons["headers"]
+        kode = int(respons["status"].split(" ", 1)[0])
+        if encoding is None or kode < 200 or kode in (204, 206, 304):
+            return False
+        if _header(headers, "Content-Encoding") or "no-transform" in (_header(headers, "Cache-Control") or ""):
+            return False
+        if not self._teks(headers):
+            return False
+        panjang = _header(headers, "Content-Length")
+        return panjang is None or int(panjang) >= self.ukuran_minimum
+
+    def _teks(self, headers):
+        tipe = (_header(headers, "Content-Type") or "").split(";", 1)[0].strip().lower()
+        return tipe in TIPE_TEKS
+
+    def _header_tanpa_kompres(self, respons):
+        headers = respons["headers"]
+        # Isi respons teks bergantung pada Accept-Encoding, jadi cache di antara
+        # server dan browser harus menyimpan versi terpisah per encoding
+        if self._teks(headers) and not _header(headers, "Content-Encoding"):
+            _tambah_vary(headers, "Accept-Encoding")
+        return headers
+
+    def _alirkan(self, body, respons, start_response, encoding):
+        iterator = iter(body)
+        try:
+            # Potongan yang ditulis lewat write() dikirim lebih dulu
+            awal = list(respons.get("tulis") or [])
+            ukuran = sum(len(p) for p in awal)
+            kompres = False
+            if "status" not in respons or self._perlu_kompres(respons, encoding):
+                # Tahan potongan awal sampai ukuran minimum: respons kecil tidak dikompres
+                for potongan in iterator:
+                    awal.append(potongan)
+                    ukuran += len(potongan)
+                    if ukuran >= self.ukuran_minimum:
+                        break
+                kompres = ukuran >= self.ukuran_minimum and self._perlu_kompres(respons, encoding)
+
+            headers = self._header_tanpa_kompres(respons)
+            if not kompres:
+                start_response(respons["status"], headers)
+                respons["terkirim"] = True
+                yield from awal
+                yield from iterator
+                return
+
+            headers = [(k, v) for k, v in headers if k.lower() != "content-length"]
+            headers.append(("Content-Encoding", encoding))
+            # ETag kuat berlaku untuk byte yang persis sama; isi terkompres
+            # hanya setara secara makna, jadi ETag diturunkan menjadi lemah
+            for i, (k, v) in enumerate(headers):
+                if k.lower() == "etag" and not v.startswith("W/"):
+                    headers[i] = (k, "W/" + v)
+            start_response(respons["status"], headers)
+            respons["terkirim"] = True
+
+            kompresor = self._kompresor(encoding)
+            yield kompresor.kompres(b"".join(awal))
+            for potongan in iterator:
+                if potongan:
+                    yield kompresor.kompres(potongan)
+            yield kompresor.selesai()
+        finally:
+            tutup = getattr(body, "close", None)
+            if tutup is not None:
+                tutup()
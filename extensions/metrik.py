@@ -0,0 +1,167 @@
+# ---------------------------
+# METRIK (FORMAT TEKS PROMETHEUS)
+# ---------------------------
+# Registri metrik sederhana tanpa dependency: counter, gauge dan histogram
+# dengan label, aman dipakai dari banyak thread, dan ditulis dalam format
+# teks exposition Prometheus (versi 0.0.4) untuk endpoint /metrics.
+# Nilai disimpan di memori proses: setiap worker gunicorn punya angkanya
+# sendiri, jadi scrape setiap worker (atau jalankan satu worker per container).
+import math, threading
+from bisect import bisect_left
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Batas bucket default (detik), dari query cepat sampai laporan yang sangat lambat
+BUCKET_DETIK = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+def _angka(nilai):
+    if isinstance(nilai, float):
+        if math.isinf(nilai):
+            return "+Inf" if nilai > 0 else "-Inf"
+        if nilai.is_integer() and abs(nilai) < 1e15:
+            return str(int(nilai))
+        return repr(nilai)
+    return str(nilai)
+
+def _escape(nilai):
+    """Nilai label: backslash, kutip dan baris baru di-escape"""
+    return str(nilai).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _label(nama_label, nilai_label, tambahan=()):
+    bagian = [f'{nama}="{_escape(nilai)}"' for nama, nilai in zip(nama_label, nilai_label)]
+    bagian += [f'{nama}="{_escape(nilai)}"' for nama, nilai in tambahan]
+    return "{" + ",".join(bagian) + "}" if bagian else ""
+
+class Metrik:
+    """
+    Dasar semua metrik: nama, teks bantuan dan nama label
+    """
+
+    tipe = "untyped"
+
+    def __init__(self, nama, bantuan, label=()):
+        self.nama = nama
+        self.bantuan = bantuan
+        self.label = tuple(label)
+        self._nilai = {}
+        self._kunci = threading.Lock()
+
+    def _kunci_label(self, label):
+        if set(label) != set(self.label):
+            raise ValueError(f"Label {self.nama} harus {self.label}, bukan {tuple(label)}")
+        return tuple(str(label[nama]) for nama in self.label)
+
+    def baris(self):
+        raise NotImplementedError
+
+    def teks(self):
+        return "\n".join([f"# HELP {self.nama} {self.bantuan}", f"# TYPE {self.nama} {self.tipe}"] + self.baris())
+
+class MetrikCounter(Metrik):
+    """Nilai yang hanya naik (nama diakhiri _total)"""
+
+    tipe = "counter"
+
+    def inc(self, nilai=1, **label):
+        key = self._kunci_label(label)
+        with self._kunci:
+            self._nilai[key] = self._nilai.get(key, 0) + nilai
+
+    def nilai(self, **label):
+        return self._nilai.get(self._kunci_label(label), 0)
+
+    def baris(self):
+        with self._kunci:
+            data = sorted(self._nilai.items())
+        return [f"{self.nama}{_label(self.label, key)} {_angka(n)}" for key, n in data]
+
+class MetrikGauge(Metrik):
+    """
+    Nilai yang bisa naik turun. Jika fungsi diberikan, nilainya dibaca saat
+    scrape (tanpa label).
+    """
+
+    tipe = "gauge"
+
+    def __init__(self, nama, bantuan, label=(), fungsi=None):
+        super().__init__(nama, bantuan, label)
+        self.fungsi = fungsi
+
+    def set(self, nilai, **label):
+        key = self._kunci_label(label)
+        with self._kunci:
+            self._nilai[key] = nilai
+
+    def baris(self):
+        if self.fungsi:
+            return [f"{self.nama} {_angka(self.fungsi())}"]
+        with self._kunci:
+            data = sorted(self._nilai.items())
+        return [f"{self.nama}{_label(self.label, key)} {_angka(n)}" for key, n in data]
+
+class MetrikHistogram(Metrik):
+    """
+    Sebaran nilai dalam bucket kumulatif (le), beserta _sum dan _count
+    """
+
+    tipe = "histogram"
+
+    def __init__(self, nama, bantuan, label=(), bucket=BUCKET_DETIK):
+        super().__init__(nama, bantuan, label)
+        self.bucket = tuple(sorted(bucket))
+
+    def observe(self, nilai, **label):
+        key = self._kunci_label(label)
+        # Indeks bucket terkecil yang batasnya >= nilai (len(bucket) = +Inf)
+        posisi = bisect_left(self.bucket, nilai)
+        with self._kunci:
+            data = self._nilai.get(key)
+            if data is None:
+                data = self._nilai[key] = [[0] * (len(self.bucket) + 1), 0.0, 0]
+            data[0][posisi] += 1
+            data[1] += nilai
+            data[2] += 1
+
+    def baris(self):
+        with self._kunci:
+            data = sorted((key, (list(jumlah), total, n)) for key, (jumlah, total, n) in self._nilai.items())
+        hasil = []
+        for key, (jumlah, total, n) in data:
+            kumulatif = 0
+            for batas, isi in zip(self.bucket + (math.inf,), jumlah):
+                kumulatif += isi
+                le = _label(self.label, key, [("le", _angka(float(batas)))])
+                hasil.append(f"{self.nama}_bucket{le} {kumulatif}")
+            hasil.append(f"{self.nama}_sum{_label(self.label, key)} {_angka(total)}")
+            hasil.append(f"{self.nama}_count{_label(self.label, key)} {n}")
+        return hasil
+
+class RegistriMetrik:
+    """
+    Kumpulan metrik satu proses; teks() menghasilkan isi endpoint /metrics
+    """
+
+    def __init__(self):
+        self.metrik = {}
+        self._kunci = threading.Lock()
+
+    def _daftar(self, metrik):
+        with self._kunci:
+            if metrik.nama in self.metrik:
+                raise ValueError(f"Metrik {metrik.nama} sudah terdaftar")
+            self.metrik[metrik.nama] = metrik
+        return metrik
+
+    def counter(self, nama, bantuan, label=()):
+        return self._daftar(MetrikCounter(nama, bantuan, label))
+
+    def gauge(self, nama, bantuan, label=(), fungsi=None):
+        return self._daftar(MetrikGauge(nama, bantuan, label, fungsi))
+
+    def histogram(self, nama, bantuan, label=(), bucket=BUCKET_DETIK):
+        return self._daftar(MetrikHistogram(nama, bantuan, label, bucket))
+
+    def teks(self):
+        with self._kunci:
+            daftar = list(self.metrik.values())
+        return "\n".join(m.teks() for m in daftar) + "\n"
@@ -0,0 +1,159 @@
+# ---------------------------
+# PENYIMPANAN DATA (REPOSITORY)
+# ---------------------------
+# Semua akses data aplikasi (jurnal umum, jurnal penyesuaian, saldo awal,
+# user, dan rekap saldo) lewat satu objek Penyimpanan. Backend dipilih lewat
+# env STORAGE_BACKEND:
+#   supabase (default) : Supabase/PostgREST (SUPABASE_URL, SUPABASE_KEY)
+#   sqlite             : file SQLite lokal (SQLITE_PATH, default belut_in.db),
+#                        untuk instalasi satu peternakan tanpa server database
+#                        dan untuk mengukur performa secara offline
+#
+# Baris yang dikembalikan berbentuk dict dengan nama kolom tabel Supabase, dan
+# nominal uang dalam rupiah (seperti yang dibaca dari numeric(18,2)); aplikasi
+# mengubahnya ke sen dengan ke_sen. Nominal filter (min/maks) dalam sen.
+#
+# Method antarmuka di setiap backend otomatis diukur sebagai fase "db" pada
+# profil request (profil.py); backend sendiri mencatat query per tabel.
+# Semua method antarmuka abstrak: backend yang belum mengimplementasikan salah
+# satunya gagal saat dibuat (TypeError), bukan saat route memanggilnya.
+import os
+from abc import ABC, abstractmethod
+from profil import ukur_db
+
+class Penyimpanan(ABC):
+    """
+    Antarmuka penyimpanan. Setiap method menerima email user pemilik data
+    (kecuali method user) dan tidak pernah mengembalikan data user lain.
+    """
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        for nama, fungsi in list(vars(cls).items()):
+            if not nama.startswith("_") and callable(fungsi) and nama in vars(Penyimpanan):
+                setattr(cls, nama, ukur_db(fungsi))
+
+    # ---- User ----
+    @abstractmethod
+    def cari_user(self, email):
+        """Baris users dengan email tersebut, None jika belum terdaftar"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def tambah_user(self, email, password):
+        raise NotImplementedError
+
+    # ---- Jurnal umum ----
+    @abstractmethod
+    def simpan_jurnal(self, user, tanggal, keterangan, lines):
+        """
+        Simpan header + baris jurnal dalam satu transaksi. lines: list dict
+        account_code, account_name, debit, credit (rupiah). Return id jurnal.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def halaman_jurnal(self, user, saring, kursor=None, terbaru_dulu=False, batas=50):
+        """
+        Paling banyak `batas` jurnal {id, date, description, lines} urut (date, id),
+        sesudah kursor (date, id) jika ada. saring: dict dari baca_filter_jurnal
+        (dari, sampai, akun, min, maks dalam sen, cari).
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def jurnal_per_akun(self, user, kode):
+        """Jurnal {id, lines} yang punya baris dengan kode akun tersebut, urut id"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def semua_jurnal(self, user):
+        """Generator semua jurnal {id, date, description, lines} urut (date, id)"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def hitung_jurnal(self, user):
+        raise NotImplementedError
+
+    @abstractmethod
+    def hapus_jurnal(self, user, entry_id):
+        raise NotImplementedError
+
+    @abstractmethod
+    def hapus_semua_jurnal(self, user):
+        raise NotImplementedError
+
+    # ---- Jurnal penyesuaian ----
+    @abstractmethod
+    def simpan_penyesuaian(self, user, rows):
+        """
+        Simpan semua baris penyesuaian (no, date, description, ref, debit,
+        credit, is_indent) sekaligus: tersimpan semua atau tidak sama sekali
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def semua_penyesuaian(self, user, urut_nomor=False):
+        """Semua baris adjustment_journal urut (date, id), atau (no, id) jika urut_nomor"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def hapus_penyesuaian(self, user, entry_id):
+        raise NotImplementedError
+
+    # ---- Saldo awal ----
+    @abstractmethod
+    def simpan_saldo_awal(self, user, row):
+        """row: account_code, account_name, debit, credit (rupiah)"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def semua_saldo_awal(self, user):
+        """Semua baris opening_balance urut id"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def hapus_saldo_awal(self, user, entry_id):
+        raise NotImplementedError
+
+    @abstractmethod
+    def hapus_semua_saldo_awal(self, user):
+        raise NotImplementedError
+
+    # ---- Transaksi lama (tabel transactions, hanya dibaca) ----
+    @abstractmethod
+    def semua_transaksi(self, user):
+        raise NotImplementedError
+
+    # ---- Rekap saldo ----
+    @abstractmethod
+    def saldo_akun(self, user):
+        """
+        Baris account_balances (account_code, account_name, stage, total_debit,
+        total_kredit) urut (account_code, stage)
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def saldo_akun_bulanan(self, user, bulan):
+        """Seperti saldo_akun, tetapi hanya mutasi bulan (date hari pertama bulan)"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def versi_ledger(self, user):
+        """Angka yang naik setiap kali data ledger user berubah"""
+        raise NotImplementedError
+
+def buat_penyimpanan(backend=None):
+    """
+    Objek Penyimpanan sesuai STORAGE_BACKEND
+    """
+    backend = (backend or os.getenv("STORAGE_BACKEND") or "supabase").strip().lower()
+    if backend == "supabase":
+        from .db_supabase import PenyimpananSupabase
+        from supabase import create_client
+        return PenyimpananSupabase(create_client(os.getenv("SUPABASE_URL"), os.getenv("SUPABASE_KEY")))
+    if backend == "sqlite":
+        from .db_sqlite import PenyimpananSQLite
+        return PenyimpananSQLite(os.getenv("SQLITE_PATH") or "belut_in.db")
+    raise ValueError(f"STORAGE_BACKEND tidak dikenal: {backend!r} (pilih supabase atau sqlite)")
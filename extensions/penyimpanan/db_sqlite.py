@@ -0,0 +1,456 @@
+# ---------------------------
+# PENYIMPANAN SQLITE (EMBEDDED)
+# ---------------------------
+# Satu file database lokal, tanpa server. Dipakai dengan STORAGE_BACKEND=sqlite.
+# - Mode WAL: pembaca tidak menunggu penulis, jadi beberapa thread/worker
+#   gunicorn bisa membaca laporan sambil ada transaksi yang disimpan
+# - Satu koneksi per thread (objek sqlite3 tidak boleh dipakai lintas thread)
+# - Nominal disimpan sebagai INTEGER sen, diubah ke rupiah saat dibaca
+# - account_balances, account_balances_bulanan dan ledger_versions dipelihara
+#   trigger, sama seperti migrasi Supabase, jadi laporan tetap membaca
+#   O(jumlah akun) baris
+import datetime, json, re, sqlite3, threading, time
+from itertools import groupby
+from uang import ke_sen, sen_ke_angka
+from profil import catat_query
+from . import Penyimpanan
+
+# Kolom baris jurnal yang dikembalikan (sama dengan KOLOM_BARIS_JURNAL di Supabase)
+_KOLOM_BARIS = "account_code, account_name, debit, credit, line_no"
+
+_SKEMA = """
+create table if not exists users (
+    id integer primary key,
+    email text not null unique,
+    password text
+);
+
+create table if not exists general_journal (
+    id integer primary key,
+    user_email text not null,
+    date text,
+    description text,
+    created_at text default current_timestamp
+);
+create index if not exists general_journal_user_tanggal_id_idx
+    on general_journal (user_email, date, id);
+
+create table if not exists journal_lines (
+    id integer primary key,
+    journal_id integer not null references general_journal (id) on delete cascade,
+    user_email text not null,
+    date text,
+    line_no integer not null default 1,
+    account_code text not null,
+    account_name text,
+    debit integer not null default 0,
+    credit integer not null default 0
+);
+create index if not exists journal_lines_user_akun_tanggal_idx
+    on journal_lines (user_email, account_code, date);
+create index if not exists journal_lines_user_tanggal_idx
+    on journal_lines (user_email, date, journal_id, line_no);
+create index if not exists journal_lines_journal_debit_idx
+    on journal_lines (journal_id, debit);
+
+create table if not exists adjustment_journal (
+    id integer primary key,
+    user_email text not null,
+    no integer,
+    date text,
+    description text,
+    ref text,
+    debit integer not null default 0,
+    credit integer not null default 0,
+    is_indent integer not null default 0
+);
+create index if not exists adjustment_journal_user_tanggal_idx
+    on adjustment_journal (user_email, date, id);
+
+create table if not exists opening_balance (
+    id integer primary key,
+    user_email text not null,
+    account_code text,
+    account_name text,
+    debit integer not null default 0,
+    credit integer not null default 0,
+    created_at text
+);
+create index if not exists opening_balance_user_akun_idx
+    on opening_balance (user_email, account_code);
+
+create table if not exists transactions (
+    id integer primary key,
+    user_email text not null,
+    transaction_type text,
+    amount integer not null default 0,
+    lines text
+);
+create index if not exists transactions_user_idx
+    on transactions (user_email);
+
+create table if not exists account_balances (
+    user_email text not null,
+    account_code text not null,
+    stage text not null check (stage in ('umum', 'penyesuaian', 'saldo_awal')),
+    account_name text,
+    total_debit integer not null default 0,
+    total_kredit integer not null default 0,
+    jumlah_baris integer not null default 0,
+    primary key (user_email, account_code, stage)
+) without rowid;
+
+create table if not exists account_balances_bulanan (
+    user_email text not null,
+    bulan text not null,
+    account_code text not null,
+    stage text not null check (stage in ('umum', 'penyesuaian')),
+    account_name text,
+    total_debit integer not null default 0,
+    total_kredit integer not null default 0,
+    jumlah_baris integer not null default 0,
+    primary key (user_email, bulan, account_code, stage)
+) without rowid;
+
+create table if not exists ledger_versions (
+    user_email text primary key,
+    versi integer not null default 0
+) without rowid;
+"""
+
+# Tabel sumber saldo: (tabel, stage, kolom kode akun, kolom nama akun, ikut rekap bulanan)
+_SUMBER_SALDO = (
+    ("journal_lines", "umum", "account_code", "account_name", True),
+    ("adjustment_journal", "penyesuaian", "ref", "description", True),
+    ("opening_balance", "saldo_awal", "account_code", "account_name", False),
+)
+
+def _sql_ubah_saldo(stage, kode, nama, bulanan, rec, arah):
+    """
+    Isi trigger: tambah (arah 1) atau kurangi (arah -1) saldo akun dari baris
+    rec ('new' / 'old'), lalu naikkan versi ledger user
+    """
+    sql = f"""
+    insert into account_balances
+        (user_email, account_code, stage, account_name, total_debit, total_kredit, jumlah_baris)
+    select {rec}.user_email, {rec}.{kode}, '{stage}', {rec}.{nama},
+           {arah} * {rec}.debit, {arah} * {rec}.credit, {arah}
+    where coalesce({rec}.{kode}, '') <> ''
+    on conflict (user_email, account_code, stage) do update set
+        account_name = coalesce(account_name, excluded.account_name),
+        total_debit = total_debit + excluded.total_debit,
+        total_kredit = total_kredit + excluded.total_kredit,
+        jumlah_baris = jumlah_baris + excluded.jumlah_baris;
+    """
+    if bulanan:
+        # date() bernilai null untuk tanggal kosong/tidak valid: baris tidak masuk rekap bulanan
+        sql += f"""
+    insert into account_balances_bulanan
+        (user_email, bulan, account_code, stage, account_name, total_debit, total_kredit, jumlah_baris)
+    select {rec}.user_email, date({rec}.date, 'start of month'), {rec}.{kode}, '{stage}', {rec}.{nama},
+           {arah} * {rec}.debit, {arah} * {rec}.credit, {arah}
+    where coalesce({rec}.{kode}, '') <> '' and date({rec}.date, 'start of month') is not null
+    on conflict (user_email, bulan, account_code, stage) do update set
+        account_name = coalesce(account_name, excluded.account_name),
+        total_debit = total_debit + excluded.total_debit,
+        total_kredit = total_kredit + excluded.total_kredit,
+        jumlah_baris = jumlah_baris + excluded.jumlah_baris;
+    """
+    if arah < 0:
+        # Akun tanpa baris tersisa dihapus agar tidak muncul sebagai saldo 0 di laporan
+        sql += f"""
+    delete from account_balances
+    where user_email = {rec}.user_email and account_code = {rec}.{kode}
+      and stage = '{stage}' and jumlah_baris <= 0;
+    """
+        if bulanan:
+            sql += f"""
+    delete from account_balances_bulanan
+    where user_email = {rec}.user_email and bulan = date({rec}.date, 'start of month')
+      and account_code = {rec}.{kode} and stage = '{stage}' and jumlah_baris <= 0;
+    """
+    sql += f"""
+    insert into ledger_versions (user_email, versi) values ({rec}.user_email, 1)
+    on conflict (user_email) do update set versi = versi + 1;
+    """
+    return sql
+
+def _skema_trigger():
+    sql = []
+    for tabel, stage, kode, nama, bulanan in _SUMBER_SALDO:
+        tambah = _sql_ubah_saldo(stage, kode, nama, bulanan, "new", 1)
+        kurang = _sql_ubah_saldo(stage, kode, nama, bulanan, "old", -1)
+        sql.append(f"create trigger if not exists {tabel}_saldo_insert after insert on {tabel} begin {tambah} end;")
+        sql.append(f"create trigger if not exists {tabel}_saldo_delete after delete on {tabel} begin {kurang} end;")
+        sql.append(f"create trigger if not exists {tabel}_saldo_update after update on {tabel} begin {kurang} {tambah} end;")
+    return "\n".join(sql)
+
+# Tabel utama statement (untuk profil request): tabel pertama setelah from/into/update
+_TABEL_SQL = re.compile(r"\b(?:from|into|update)\s+(\w+)", re.IGNORECASE)
+
+def _catat_sql(sql, baris, mulai):
+    tabel = _TABEL_SQL.search(sql)
+    catat_query(tabel.group(1) if tabel else "?", sql.split(None, 1)[0].lower(), baris, time.perf_counter() - mulai)
+
+def _ke_rupiah(row, *kolom):
+    """
+    dict dari sqlite3.Row dengan kolom nominal (sen) diubah ke rupiah
+    """
+    row = dict(row)
+    for k in kolom:
+        if row.get(k) is not None:
+            row[k] = sen_ke_angka(row[k])
+    return row
+
+class PenyimpananSQLite(Penyimpanan):
+    """
+    Penyimpanan di file SQLite (path). Database dan skemanya dibuat jika belum ada.
+    """
+
+    def __init__(self, path):
+        if path == ":memory:" or not path:
+            # Database memori tidak bisa dibagi antar koneksi per thread
+            raise ValueError("SQLITE_PATH harus berupa path file, bukan :memory:")
+        self.path = path
+        self._lokal = threading.local()
+        with self.conn as conn:
+            conn.executescript(_SKEMA + _skema_trigger())
+
+    def _buka(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        conn.execute("pragma journal_mode = wal")
+        # Aman di mode WAL: commit tetap atomik, fsync hanya saat checkpoint
+        conn.execute("pragma synchronous = normal")
+        conn.execute("pragma foreign_keys = on")
+        conn.execute("pragma busy_timeout = 30000")
+        return conn
+
+    @property
+    def conn(self):
+        """Koneksi milik thread yang sedang berjalan"""
+        conn = getattr(self._lokal, "conn", None)
+        if conn is None:
+            conn = self._lokal.conn = self._buka()
+        return conn
+
+    def _semua(self, sql, params=()):
+        mulai = time.perf_counter()
+        rows = self.conn.execute(sql, params).fetchall()
+        _catat_sql(sql, len(rows), mulai)
+        return rows
+
+    def _tulis(self, sql, params=()):
+        mulai = time.perf_counter()
+        # "with conn": commit jika berhasil, rollback jika error
+        with self.conn as conn:
+            cur = conn.execute(sql, params)
+        _catat_sql(sql, cur.rowcount, mulai)
+        return cur
+
+    def _tulis_banyak(self, conn, sql, rows):
+        mulai = time.perf_counter()
+        conn.executemany(sql, rows)
+        _catat_sql(sql, len(rows), mulai)
+
+    # ---- User ----
+    def cari_user(self, email):
+        rows = self._semua("select * from users where email = ?", (email,))
+        return dict(rows[0]) if rows else None
+
+    def tambah_user(self, email, password):
+        self._tulis("insert into users (email, password) values (?, ?)", (email, password))
+
+    # ---- Jurnal umum ----
+    def simpan_jurnal(self, user, tanggal, keterangan, lines):
+        with self.conn as conn:
+            mulai = time.perf_counter()
+            sql = "insert into general_journal (user_email, date, description) values (?, ?, ?)"
+            entry_id = conn.execute(sql, (user, tanggal, keterangan)).lastrowid
+            _catat_sql(sql, 1, mulai)
+            self._tulis_banyak(
+                conn,
+                "insert into journal_lines (journal_id, user_email, date, line_no, account_code, account_name, debit, credit)"
+                " values (?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (entry_id, user, tanggal, no, b["account_code"], b.get("account_name"),
+                     ke_sen(b.get("debit")), ke_sen(b.get("credit")))
+                    for no, b in enumerate(lines, 1)
+                ]
+            )
+        return entry_id
+
+    def _isi_lines(self, headers):
+        """
+        Tambahkan key "lines" (urut line_no) ke setiap header jurnal
+        """
+        data = [dict(h) for h in headers]
+        lines = {}
+        # Dipecah per 500 id agar tidak melewati batas parameter SQLite
+        for i in range(0, len(data), 500):
+            ids = [h["id"] for h in data[i:i + 500]]
+            for b in self._semua(
+                f"select journal_id, {_KOLOM_BARIS} from journal_lines"
+                f" where journal_id in ({','.join('?' * len(ids))}) order by journal_id, line_no, id", ids
+            ):
+                lines.setdefault(b["journal_id"], []).append(_ke_rupiah(b, "debit", "credit"))
+        for h in data:
+            h["lines"] = [{k: v for k, v in b.items() if k != "journal_id"} for b in lines.get(h["id"], [])]
+        return data
+
+    def halaman_jurnal(self, user, saring, kursor=None, terbaru_dulu=False, batas=50):
+        where = ["g.user_email = ?"]
+        params = [user]
+        if "dari" in saring:
+            where.append("g.date >= ?")
+            params.append(saring["dari"])
+        if "sampai" in saring:
+            where.append("g.date <= ?")
+            params.append(saring["sampai"])
+        if "cari" in saring:
+            # LIKE di SQLite tidak peka huruf besar/kecil (ASCII), seperti ilike
+            cari = saring["cari"].replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            where.append("g.description like ? escape '\\'")
+            params.append(f"%{cari}%")
+        if "akun" in saring:
+            where.append("exists (select 1 from journal_lines l where l.journal_id = g.id and l.account_code = ?)")
+            params.append(saring["akun"])
+        if "min" in saring or "maks" in saring:
+            # Hanya baris sisi debit: baris kredit (debit = 0) selalu lolos batas maks
+            syarat = ["l.journal_id = g.id", "l.debit > 0"]
+            if "min" in saring:
+                syarat.append("l.debit >= ?")
+                params.append(saring["min"])
+            if "maks" in saring:
+                syarat.append("l.debit <= ?")
+                params.append(saring["maks"])
+            where.append(f"exists (select 1 from journal_lines l where {' and '.join(syarat)})")
+
+        if kursor:
+            # Row value (date, id) memakai index (user_email, date, id)
+            where.append("(g.date, g.id) < (?, ?)" if terbaru_dulu else "(g.date, g.id) > (?, ?)")
+            params.extend(kursor)
+
+        arah = "desc" if terbaru_dulu else "asc"
+        headers = self._semua(
+            f"select g.id, g.date, g.description from general_journal g where {' and '.join(where)}"
+            f" order by g.date {arah}, g.id {arah} limit ?", params + [batas]
+        )
+        return self._isi_lines(headers)
+
+    def jurnal_per_akun(self, user, kode):
+        rows = self._semua(
+            f"select journal_id, {_KOLOM_BARIS} from journal_lines"
+            " where user_email = ? and journal_id in ("
+            "   select journal_id from journal_lines where user_email = ? and account_code = ?"
+            " ) order by journal_id, line_no, id",
+            (user, user, kode)
+        )
+        return [
+            {"id": jid, "lines": [_ke_rupiah(b, "debit", "credit") for b in baris]}
+            for jid, baris in groupby(rows, key=lambda b: b["journal_id"])
+        ]
+
+    def semua_jurnal(self, user):
+        sql = (
+            "select g.id, g.date, g.description, l.account_code, l.account_name, l.debit, l.credit, l.line_no"
+            " from general_journal g left join journal_lines l on l.journal_id = g.id"
+            " where g.user_email = ? order by g.date, g.id, l.line_no, l.id"
+        )
+        # Dicatat sekali setelah selesai; waktu saat pemakai memproses jurnal tidak ikut
+        mulai = time.perf_counter()
+        durasi = jumlah = 0
+        cur = self.conn.execute(sql, (user,))
+        for (entry_id, tanggal, keterangan), baris in groupby(cur, key=lambda r: (r["id"], r["date"], r["description"])):
+            row = {
+                "id": entry_id,
+                "date": tanggal,
+                "description": keterangan,
+                "lines": [
+                    {"account_code": b["account_code"], "account_name": b["account_name"],
+                     "debit": sen_ke_angka(b["debit"]), "credit": sen_ke_angka(b["credit"]), "line_no": b["line_no"]}
+                    for b in baris if b["line_no"] is not None
+                ],
+            }
+            jumlah += max(len(row["lines"]), 1)
+            durasi += time.perf_counter() - mulai
+            yield row
+            mulai = time.perf_counter()
+        catat_query("general_journal", "select", jumlah, durasi + time.perf_counter() - mulai)
+
+    def hitung_jurnal(self, user):
+        return self._semua("select count(*) from general_journal where user_email = ?", (user,))[0][0]
+
+    def hapus_jurnal(self, user, entry_id):
+        # journal_lines ikut terhapus (on delete cascade, trigger saldo tetap berjalan)
+        self._tulis("delete from general_journal where id = ? and user_email = ?", (entry_id, user))
+
+    def hapus_semua_jurnal(self, user):
+        self._tulis("delete from general_journal where user_email = ?", (user,))
+
+    # ---- Jurnal penyesuaian ----
+    def simpan_penyesuaian(self, user, rows):
+        with self.conn as conn:
+            self._tulis_banyak(
+                conn,
+                "insert into adjustment_journal (user_email, no, date, description, ref, debit, credit, is_indent)"
+                " values (?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (user, r.get("no"), r.get("date"), r.get("description"), r.get("ref"),
+                     ke_sen(r.get("debit")), ke_sen(r.get("credit")), 1 if r.get("is_indent") else 0)
+                    for r in rows
+                ]
+            )
+
+    def semua_penyesuaian(self, user, urut_nomor=False):
+        kolom_urut = "no" if urut_nomor else "date"
+        rows = self._semua(f"select * from adjustment_journal where user_email = ? order by {kolom_urut}, id", (user,))
+        return [dict(_ke_rupiah(r, "debit", "credit"), is_indent=bool(r["is_indent"])) for r in rows]
+
+    def hapus_penyesuaian(self, user, entry_id):
+        self._tulis("delete from adjustment_journal where id = ? and user_email = ?", (entry_id, user))
+
+    # ---- Saldo awal ----
+    def simpan_saldo_awal(self, user, row):
+        self._tulis(
+            "insert into opening_balance (user_email, account_code, account_name, debit, credit, created_at)"
+            " values (?, ?, ?, ?, ?, ?)",
+            (user, row["account_code"], row.get("account_name"), ke_sen(row.get("debit")),
+             ke_sen(row.get("credit")), datetime.datetime.utcnow().isoformat())
+        )
+
+    def semua_saldo_awal(self, user):
+        rows = self._semua("select * from opening_balance where user_email = ? order by id", (user,))
+        return [_ke_rupiah(r, "debit", "credit") for r in rows]
+
+    def hapus_saldo_awal(self, user, entry_id):
+        self._tulis("delete from opening_balance where id = ? and user_email = ?", (entry_id, user))
+
+    def hapus_semua_saldo_awal(self, user):
+        self._tulis("delete from opening_balance where user_email = ?", (user,))
+
+    # ---- Transaksi lama ----
+    def semua_transaksi(self, user):
+        for r in self._semua("select * from transactions where user_email = ? order by id", (user,)):
+            r = _ke_rupiah(r, "amount")
+            r["lines"] = json.loads(r["lines"]) if r.get("lines") else []
+            yield r
+
+    # ---- Rekap saldo ----
+    def saldo_akun(self, user):
+        rows = self._semua(
+            "select account_code, account_name, stage, total_debit, total_kredit from account_balances"
+            " where user_email = ? order by account_code, stage", (user,)
+        )
+        return [_ke_rupiah(r, "total_debit", "total_kredit") for r in rows]
+
+    def saldo_akun_bulanan(self, user, bulan):
+        rows = self._semua(
+            "select account_code, account_name, stage, total_debit, total_kredit from account_balances_bulanan"
+            " where user_email = ? and bulan = ? order by account_code, stage", (user, bulan.isoformat())
+        )
+        return [_ke_rupiah(r, "total_debit", "total_kredit") for r in rows]
+
+    def versi_ledger(self, user):
+        rows = self._semua("select versi from ledger_versions where user_email = ?", (user,))
+        return rows[0]["versi"] if rows else 0
@@ -0,0 +1,353 @@
+# ---------------------------
+# PENYIMPANAN SUPABASE (POSTGREST)
+# ---------------------------
+import contextvars, datetime, os, re, time
+from collections import deque
+from decimal import Decimal
+from concurrent.futures import ThreadPoolExecutor
+from postgrest.exceptions import APIError
+from uang import ke_sen, sen_ke_angka
+from profil import catat_query
+from . import Penyimpanan
+
+# ---------------------------
+# AMBIL DATA BERHALAMAN (HEADER RANGE)
+# ---------------------------
+# PostgREST membatasi jumlah baris per response (max-rows, default Supabase 1000).
+# Query yang bisa besar diambil per halaman memakai header Range; halaman
+# selanjutnya diambil paralel di thread pool yang dibatasi ukurannya.
+UKURAN_HALAMAN = int(os.getenv("SUPABASE_PAGE_SIZE") or 1000)
+MAKS_THREAD_HALAMAN = int(os.getenv("SUPABASE_FETCH_THREADS") or 4)
+_pool_halaman = ThreadPoolExecutor(max_workers=MAKS_THREAD_HALAMAN, thread_name_prefix="supabase-range")
+
+# Kolom journal_lines yang dipakai saat di-embed ke general_journal
+KOLOM_BARIS_JURNAL = "account_code, account_name, debit, credit, line_no"
+
+def lines_dari_embed(row):
+    """
+    Mengambil baris journal_lines yang di-embed pada row general_journal, urut line_no
+    """
+    return sorted(row.pop("journal_lines", None) or [], key=lambda b: b.get("line_no") or 0)
+
+def nominal_json(row):
+    """
+    Salinan row dengan nominal Decimal (pecahan sen dari sen_ke_angka) ditulis
+    sebagai string: json bawaan Python yang dipakai httpx tidak bisa menulis
+    Decimal, sedangkan PostgREST dan simpan_jurnal menerima numeric dalam
+    bentuk string tanpa kehilangan presisi
+    """
+    return {k: str(v) if isinstance(v, Decimal) else v for k, v in row.items()}
+
+# ---------------------------
+# PENCATATAN QUERY (PROFIL REQUEST)
+# ---------------------------
+_OPERASI_HTTP = {"GET": "select", "HEAD": "select", "POST": "insert", "PATCH": "update", "DELETE": "delete"}
+
+def _jumlah_baris(response):
+    """
+    Baris dalam response PostgREST: dari Content-Range (0-49/*), atau panjang
+    array JSON jika header itu tidak ada (insert/delete dengan return=representation)
+    """
+    rentang = response.headers.get("Content-Range", "").split("/")[0]
+    if "-" in rentang:
+        awal, akhir = rentang.split("-")
+        return int(akhir) - int(awal) + 1
+    if response.content[:1] == b"[":
+        return len(response.json())
+    return 0
+
+def _mulai_request(request):
+    request.extensions["mulai_profil"] = time.perf_counter()
+
+def _catat_response(response):
+    """
+    Event hook httpx: setiap round-trip PostgREST dicatat ke profil request
+    sebagai (tabel, operasi, baris, durasi sampai isi response selesai dibaca)
+    """
+    response.read()
+    durasi = time.perf_counter() - response.request.extensions.get("mulai_profil", time.perf_counter())
+    path = response.request.url.path.rstrip("/")
+    if "/rpc/" in path:
+        operasi = "rpc"
+    else:
+        operasi = _OPERASI_HTTP.get(response.request.method, response.request.method.lower())
+    catat_query(path.rsplit("/", 1)[-1], operasi, _jumlah_baris(response), durasi)
+
+class PenyimpananSupabase(Penyimpanan):
+    """
+    Penyimpanan lewat client supabase-py. Ringkasan saldo (account_balances,
+    account_balances_bulanan, ledger_versions) dipelihara trigger di database
+    (lihat supabase/migrations).
+    """
+
+    def __init__(self, client):
+        self.client = client
+
+    @property
+    def client(self):
+        return self._client
+
+    @client.setter
+    def client(self, client):
+        # Hook dipasang di session PostgREST milik client (juga saat client diganti)
+        self._client = client
+        hooks = client.postgrest.session.event_hooks
+        if _catat_response not in hooks["response"]:
+            hooks["request"].append(_mulai_request)
+            hooks["response"].append(_catat_response)
+
+    def _query_halaman(self, tabel, kolom, saring, awal, akhir, count=None):
+        q = saring(self.client.table(tabel).select(kolom, count=count))
+        q.headers["Range-Unit"] = "items"
+        q.headers["Range"] = f"{awal}-{akhir}"
+        return q.execute()
+
+    def ambil_semua_baris(self, tabel, kolom="*", saring=lambda q: q, ukuran_halaman=None):
+        """
+        Generator semua baris hasil query, diambil per halaman dengan header Range.
+        Halaman pertama sekaligus meminta count=exact; sisa halaman diambil paralel
+        (paling banyak MAKS_THREAD_HALAMAN sekaligus) dan baris di-yield berurutan.
+        saring: fungsi yang menambahkan filter & order ke query. Order harus
+        menyertakan kolom unik (mis. id) agar halaman tidak tumpang tindih.
+        """
+        ukuran = ukuran_halaman or UKURAN_HALAMAN
+        res = self._query_halaman(tabel, kolom, saring, 0, ukuran - 1, count="exact")
+        pertama = res.data or []
+        yield from pertama
+
+        total = res.count
+        if total is None:
+            # Server tidak mengirim count: lanjutkan berurutan sampai halaman kosong
+            awal = len(pertama)
+            while pertama:
+                pertama = self._query_halaman(tabel, kolom, saring, awal, awal + ukuran - 1).data or []
+                yield from pertama
+                awal += len(pertama)
+            return
+
+        if len(pertama) >= total:
+            return
+        # max-rows di server lebih kecil dari ukuran halaman: ikuti batas server
+        if 0 < len(pertama) < ukuran:
+            ukuran = len(pertama)
+
+        halaman = list(range(len(pertama), total, ukuran))
+        antrian = deque()
+        for awal in halaman:
+            # copy_context: query di thread pool tetap tercatat di profil request ini
+            antrian.append(_pool_halaman.submit(
+                contextvars.copy_context().run,
+                self._query_halaman, tabel, kolom, saring, awal, min(awal + ukuran, total) - 1
+            ))
+            # Batasi halaman yang tertahan di memori
+            if len(antrian) > MAKS_THREAD_HALAMAN:
+                yield from antrian.popleft().result().data or []
+        while antrian:
+            yield from antrian.popleft().result().data or []
+
+    # ---- User ----
+    def cari_user(self, email):
+        rows = self.client.table("users").select("*").eq("email", email).execute().data
+        return rows[0] if rows else None
+
+    def tambah_user(self, email, password):
+        self.client.table("users").insert({"email": email, "password": password}).execute()
+
+    # ---- Jurnal umum ----
+    def simpan_jurnal(self, user, tanggal, keterangan, lines):
+        # Header (general_journal) dan baris (journal_lines) disimpan dalam satu
+        # transaksi lewat fungsi Postgres simpan_jurnal. Fungsi itu mengembalikan
+        # id (bigint), yang dikirim PostgREST sebagai angka JSON biasa; postgrest-py
+        # hanya menerima list di rpc().execute(), jadi dikirim lewat session-nya langsung.
+        res = self.client.postgrest.session.post("/rpc/simpan_jurnal", json={
+            "p_user_email": user,
+            "p_date": tanggal,
+            "p_description": keterangan,
+            "p_lines": [nominal_json(b) for b in lines]
+        })
+        if not res.is_success:
+            raise APIError(res.json())
+        return res.json()
+
+    def halaman_jurnal(self, user, saring, kursor=None, terbaru_dulu=False, batas=50):
+        kolom = f"id, date, description, journal_lines({KOLOM_BARIS_JURNAL})"
+        # Filter baris memakai embed terpisah (!inner) supaya journal_lines yang
+        # ditampilkan tetap lengkap
+        if "akun" in saring:
+            kolom += ", saring_akun:journal_lines!inner(account_code)"
+        if "min" in saring or "maks" in saring:
+            kolom += ", saring_nominal:journal_lines!inner(debit)"
+
+        q = self.client.table("general_journal").select(kolom).eq("user_email", user)
+        if "dari" in saring:
+            q = q.gte("date", saring["dari"])
+        if "sampai" in saring:
+            q = q.lte("date", saring["sampai"])
+        if "cari" in saring:
+            # Teks dicari apa adanya (seperti LIKE ber-escape di backend SQLite):
+            # ilike tidak bisa, karena PostgREST mengubah setiap * menjadi %, jadi
+            # dipakai imatch (~*) dengan semua karakter khusus regex di-escape
+            q = q.filter("description", "imatch", re.escape(saring["cari"]))
+        if "akun" in saring:
+            q = q.eq("saring_akun.account_code", saring["akun"])
+        if "min" in saring or "maks" in saring:
+            # Hanya baris sisi debit: baris kredit (debit = 0) selalu lolos batas maks
+            q = q.gt("saring_nominal.debit", 0)
+        if "min" in saring:
+            q = q.gte("saring_nominal.debit", sen_ke_angka(saring["min"]))
+        if "maks" in saring:
+            q = q.lte("saring_nominal.debit", sen_ke_angka(saring["maks"]))
+
+        if kursor:
+            tanggal, entry_id = kursor
+            op = "lt" if terbaru_dulu else "gt"
+            # (date, id) setelah (tanggal, entry_id). Batas date di luar "or" menjadi
+            # kondisi index (user_email, date, id), jadi halaman jauh tetap cepat.
+            q = q.lte("date", tanggal) if terbaru_dulu else q.gte("date", tanggal)
+            q.params = q.params.add("or", f"(date.{op}.{tanggal},and(date.eq.{tanggal},id.{op}.{entry_id}))")
+
+        q = q.order("date", desc=terbaru_dulu).order("id", desc=terbaru_dulu).limit(batas)
+        data = q.execute().data or []
+        for row in data:
+            row.pop("saring_akun", None)
+            row.pop("saring_nominal", None)
+            row["lines"] = lines_dari_embed(row)
+        return data
+
+    def jurnal_per_akun(self, user, kode):
+        # Pencarian akun memakai index journal_lines (user_email, account_code, date)
+        rows = self.ambil_semua_baris(
+            "journal_lines", "journal_id",
+            lambda q: q.eq("user_email", user).eq("account_code", kode).order("id")
+        )
+        journal_ids = sorted({b["journal_id"] for b in rows})
+
+        jurnal = {}
+        # Dipecah per 200 id agar URL filter in.(...) tidak terlalu panjang
+        for i in range(0, len(journal_ids), 200):
+            rows = self.ambil_semua_baris(
+                "journal_lines", f"journal_id, {KOLOM_BARIS_JURNAL}",
+                lambda q, ids=journal_ids[i:i + 200]: q.eq("user_email", user).in_("journal_id", ids).order("id")
+            )
+            for b in rows:
+                jurnal.setdefault(b["journal_id"], []).append(b)
+
+        return [
+            {"id": jid, "lines": sorted(jurnal[jid], key=lambda b: b.get("line_no") or 0)}
+            for jid in journal_ids if jid in jurnal
+        ]
+
+    def semua_jurnal(self, user):
+        # Baris journal_lines di-embed ke header dan disimpan di key "lines"
+        for row in self.ambil_semua_baris(
+            "general_journal",
+            f"id, date, description, journal_lines({KOLOM_BARIS_JURNAL})",
+            lambda q: q.eq("user_email", user).order("date", desc=False).order("id", desc=False)
+        ):
+            row["lines"] = lines_dari_embed(row)
+            yield row
+
+    def hitung_jurnal(self, user):
+        # Hanya header Content-Range yang dipakai (postgrest-py belum punya HEAD)
+        res = self.client.table("general_journal").select("id", count="exact").eq("user_email", user).limit(1).execute()
+        return res.count if res.count is not None else len(res.data or [])
+
+    def hapus_jurnal(self, user, entry_id):
+        # journal_lines ikut terhapus (on delete cascade)
+        self.client.table("general_journal").delete().eq("id", entry_id).eq("user_email", user).execute()
+
+    def hapus_semua_jurnal(self, user):
+        self.client.table("general_journal").delete().eq("user_email", user).execute()
+
+    # ---- Jurnal penyesuaian ----
+    def simpan_penyesuaian(self, user, rows):
+        # Satu bulk insert = satu statement INSERT di database
+        self.client.table("adjustment_journal").insert([dict(nominal_json(row), user_email=user) for row in rows]).execute()
+
+    def semua_penyesuaian(self, user, urut_nomor=False):
+        kolom_urut = "no" if urut_nomor else "date"
+        return list(self.ambil_semua_baris(
+            "adjustment_journal", "*",
+            lambda q: q.eq("user_email", user).order(kolom_urut).order("id")
+        ))
+
+    def hapus_penyesuaian(self, user, entry_id):
+        self.client.table("adjustment_journal").delete().eq("id", entry_id).eq("user_email", user).execute()
+
+    # ---- Saldo awal ----
+    def simpan_saldo_awal(self, user, row):
+        self.client.table("opening_balance").insert(dict(
+            nominal_json(row), user_email=user, created_at=datetime.datetime.utcnow().isoformat()
+        )).execute()
+
+    def semua_saldo_awal(self, user):
+        return list(self.ambil_semua_baris("opening_balance", "*", lambda q: q.eq("user_email", user).order("id")))
+
+    def hapus_saldo_awal(self, user, entry_id):
+        self.client.table("opening_balance").delete().eq("id", entry_id).eq("user_email", user).execute()
+
+    def hapus_semua_saldo_awal(self, user):
+        self.client.table("opening_balance").delete().eq("user_email", user).execute()
+
+    # ---- Transaksi lama ----
+    def semua_transaksi(self, user):
+        return self.ambil_semua_baris("transactions", "*", lambda q: q.eq("user_email", user).order("id"))
+
+    # ---- Rekap saldo ----
+    def saldo_akun(self, user):
+        # Total per akun per sumber dihitung di Postgres (fungsi rekap_saldo_akun,
+        # membaca account_balances); satu baris per akun per stage sehingga muat
+        # dalam satu response tanpa paging
+        res = self.client.postgrest.session.post("/rpc/rekap_saldo_akun", json={"p_user_email": user})
+        if res.is_success:
+            return res.json()
+        print(f"Error memanggil rekap_saldo_akun, baca account_balances: {res.json()}")
+
+        # Migrasi rekap_saldo_akun belum terpasang: baca tabelnya langsung
+        return list(self.ambil_semua_baris(
+            "account_balances",
+            "account_code, account_name, stage, total_debit, total_kredit",
+            lambda q: q.eq("user_email", user).order("account_code").order("stage")
+        ))
+
+    def saldo_akun_bulanan(self, user, bulan):
+        awal = bulan.isoformat()
+        try:
+            return list(self.ambil_semua_baris(
+                "account_balances_bulanan",
+                "account_code, account_name, stage, total_debit, total_kredit",
+                lambda q: q.eq("user_email", user).eq("bulan", awal).order("account_code").order("stage")
+            ))
+        except Exception as e:
+            print(f"Error membaca account_balances_bulanan, hitung dari jurnal: {e}")
+
+        # Migrasi account_balances_bulanan belum terpasang: jumlahkan baris bulan itu
+        akhir = (bulan + datetime.timedelta(days=32)).replace(day=1).isoformat()
+        rekap = {}
+        def tambah(kode, nama, stage, debit, kredit):
+            if not kode:
+                return
+            row = rekap.setdefault((kode, stage), {
+                "account_code": kode, "account_name": nama, "stage": stage, "total_debit": 0, "total_kredit": 0
+            })
+            # Dijumlahkan dalam sen (nilai JSON numeric dibaca sebagai float)
+            row["total_debit"] += ke_sen(debit)
+            row["total_kredit"] += ke_sen(kredit)
+        for row in self.ambil_semua_baris(
+            "journal_lines", "id, account_code, account_name, debit, credit",
+            lambda q: q.eq("user_email", user).gte("date", awal).lt("date", akhir).order("id")
+        ):
+            tambah(row["account_code"], row["account_name"], "umum", row["debit"], row["credit"])
+        for row in self.ambil_semua_baris(
+            "adjustment_journal", "id, ref, description, debit, credit",
+            lambda q: q.eq("user_email", user).gte("date", awal).lt("date", akhir).order("id")
+        ):
+            tambah(row["ref"], row["description"], "penyesuaian", row["debit"], row["credit"])
+        return [
+            dict(rekap[k], total_debit=sen_ke_angka(rekap[k]["total_debit"]), total_kredit=sen_ke_angka(rekap[k]["total_kredit"]))
+            for k in sorted(rekap)
+        ]
+
+    def versi_ledger(self, user):
+        rows = self.client.table("ledger_versions").select("versi").eq("user_email", user).execute().data
+        return rows[0]["versi"] if rows else 0
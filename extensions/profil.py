@@ -0,0 +1,191 @@
+# ---------------------------
+# PROFIL PER REQUEST
+# ---------------------------
+# Mencatat ke mana waktu satu request habis, dalam fase yang tidak tumpang tindih:
+# - db     : di dalam method Penyimpanan (round-trip Supabase/SQLite dan decode
+#            hasilnya), termasuk saat generator hasilnya diiterasi
+# - render : render template (render_template dan stream_halaman)
+# - app    : sisanya (hitung saldo, parsing lines, routing)
+# Query yang berjalan saat template dirender (generator di context) masuk ke
+# db, bukan render.
+#
+# Backend penyimpanan mencatat setiap query per (tabel, operasi) beserta jumlah
+# baris dan durasinya lewat catat_query. Profil disimpan di contextvars, jadi
+# halaman yang diambil paralel di thread pool (copy_context) tetap masuk ke
+# profil request asalnya. Di luar request yang diprofil semua fungsi di sini
+# tidak melakukan apa-apa, kecuali pendengar query (mis. metrik /metrics) yang
+# menerima setiap query dari mana pun.
+import contextvars, threading, time, types
+from contextlib import contextmanager
+from functools import wraps
+
+_profil = contextvars.ContextVar("profil_request", default=None)
+_pendengar_query = []
+
+class ProfilRequest:
+    """
+    Waktu per fase dan query per tabel untuk satu request.
+    Fase dibuka/ditutup dari thread request; catat_query boleh dari thread mana saja.
+    """
+
+    def __init__(self):
+        self.mulai = time.perf_counter()
+        self.fase = {}
+        # (tabel, operasi) -> [jumlah query, jumlah baris, detik]
+        self.query = {}
+        self._tumpukan = []
+        self._kunci = threading.Lock()
+
+    def buka(self, nama):
+        """Mulai fase; waktunya dikurangkan dari fase yang sedang terbuka"""
+        bingkai = [nama, time.perf_counter(), 0.0]
+        self._tumpukan.append(bingkai)
+        return bingkai
+
+    def tutup(self, bingkai):
+        """
+        Selesaikan fase. Fase di atasnya yang belum ditutup (mis. render yang
+        berhenti karena error) ikut ditutup.
+        """
+        if not any(b is bingkai for b in self._tumpukan):
+            return
+        while self._tumpukan:
+            atas = self._tumpukan.pop()
+            durasi = time.perf_counter() - atas[1]
+            self.fase[atas[0]] = self.fase.get(atas[0], 0.0) + durasi - atas[2]
+            if self._tumpukan:
+                self._tumpukan[-1][2] += durasi
+            if atas is bingkai:
+                return
+
+    def catat_query(self, tabel, operasi, baris, detik):
+        with self._kunci:
+            data = self.query.setdefault((tabel, operasi), [0, 0, 0.0])
+            data[0] += 1
+            data[1] += baris
+            data[2] += detik
+
+    def total(self):
+        return time.perf_counter() - self.mulai
+
+    @property
+    def jumlah_query(self):
+        return sum(q[0] for q in self.query.values())
+
+    @property
+    def jumlah_baris(self):
+        return sum(q[1] for q in self.query.values())
+
+    def waktu_fase(self):
+        """
+        Milidetik per fase ditambah app (sisa) dan total, urut db, render, lainnya
+        """
+        total = self.total()
+        fase = sorted(self.fase.items(), key=lambda f: ({"db": 0, "render": 1}.get(f[0], 2), f[0]))
+        hasil = {nama: detik * 1000 for nama, detik in fase}
+        hasil["app"] = max(total - sum(self.fase.values()), 0) * 1000
+        hasil["total"] = total * 1000
+        return hasil
+
+    def server_timing(self, keterangan_total=None):
+        """Isi header Server-Timing"""
+        bagian = []
+        for nama, ms in self.waktu_fase().items():
+            teks = f"{nama};dur={ms:.1f}"
+            if nama == "db":
+                detik_query = sum(q[2] for q in self.query.values())
+                teks += f';desc="{self.jumlah_query} query, {self.jumlah_baris} baris, round-trip {detik_query * 1000:.1f} ms"'
+            elif nama == "total" and keterangan_total:
+                teks += f';desc="{keterangan_total}"'
+            bagian.append(teks)
+        return ", ".join(bagian)
+
+    def ringkasan(self):
+        """Satu baris: waktu per fase, jumlah query dan baris"""
+        fase = ", ".join(f"{nama} {ms:.0f} ms" for nama, ms in self.waktu_fase().items())
+        return f"{fase}; {self.jumlah_query} query, {self.jumlah_baris} baris"
+
+    def rincian(self):
+        """Baris teks per tabel & operasi, urut durasi terbesar"""
+        with self._kunci:
+            data = sorted(self.query.items(), key=lambda q: -q[1][2])
+        return [
+            f"{tabel} {operasi}: {n}x, {baris} baris, {detik * 1000:.1f} ms"
+            for (tabel, operasi), (n, baris, detik) in data
+        ]
+
+def mulai():
+    """Mulai profil untuk request di context ini"""
+    profil = ProfilRequest()
+    _profil.set(profil)
+    return profil
+
+def selesai():
+    _profil.set(None)
+
+def aktif():
+    """Profil request yang sedang berjalan, atau None"""
+    return _profil.get()
+
+def tambah_pendengar_query(fungsi):
+    """Daftarkan fungsi(tabel, operasi, baris, detik) yang dipanggil untuk setiap query"""
+    _pendengar_query.append(fungsi)
+
+def catat_query(tabel, operasi, baris, detik):
+    profil = _profil.get()
+    if profil is not None:
+        profil.catat_query(tabel, operasi, baris, detik)
+    for fungsi in _pendengar_query:
+        fungsi(tabel, operasi, baris, detik)
+
+@contextmanager
+def fase(nama):
+    profil = _profil.get()
+    if profil is None:
+        yield
+        return
+    bingkai = profil.buka(nama)
+    try:
+        yield
+    finally:
+        profil.tutup(bingkai)
+
+def ukur_iterator(iterable, nama):
+    """
+    Iterasi iterable dengan waktu setiap next() dihitung sebagai fase nama.
+    Fase ditutup sebelum item diserahkan, jadi pekerjaan pemakai item tidak ikut.
+    """
+    profil = _profil.get()
+    if profil is None:
+        yield from iterable
+        return
+    iterator = iter(iterable)
+    while True:
+        bingkai = profil.buka(nama)
+        try:
+            item = next(iterator)
+        except StopIteration:
+            return
+        finally:
+            profil.tutup(bingkai)
+        yield item
+
+def ukur_db(fungsi):
+    """
+    Dekorator method penyimpanan: waktunya (dan iterasi generator hasilnya)
+    dihitung sebagai fase db
+    """
+    @wraps(fungsi)
+    def pembungkus(*args, **kwargs):
+        profil = _profil.get()
+        if profil is None:
+            return fungsi(*args, **kwargs)
+        bingkai = profil.buka("db")
+        try:
+            hasil = fungsi(*args, **kwargs)
+        finally:
+            profil.tutup(bingkai)
+        if isinstance(hasil, types.GeneratorType):
+            return ukur_iterator(hasil, "db")
+        return hasil
+    return pembungkus
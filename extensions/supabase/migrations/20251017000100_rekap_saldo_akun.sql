@@ -0,0 +1,108 @@
+-- =======================================
+-- REKAP SALDO PER AKUN (dipanggil via supabase.rpc)
+-- =======================================
+-- Mengembalikan total debit/kredit per akun yang sudah dikelompokkan di database,
+-- sehingga laporan keuangan cukup menerima satu baris per akun (±40 baris
+-- untuk DAFTAR_AKUN) dan tidak perlu mengunduh seluruh general_journal.
+--
+-- p_tahap:
+--   'sebelum_penyesuaian' : jurnal umum + saldo awal
+--   'setelah_penyesuaian' : jurnal umum + jurnal penyesuaian + saldo awal
+--   'setelah_penutupan'   : setelah penyesuaian, lalu akun nominal (4-, 5-, 6-, 8-, 9-)
+--                           dan prive (3-1200) ditutup ke Modal Pemilik (3-1100)
+--
+-- Kolom saldo_awal_debit/saldo_awal_kredit berisi porsi saldo awal dari total,
+-- dipakai untuk modal awal dan kas awal tanpa query opening_balance terpisah.
+
+create or replace function public.rekap_saldo_akun(
+    p_user_email text,
+    p_tahap text default 'setelah_penyesuaian'
+)
+returns table (
+    account_code text,
+    account_name text,
+    total_debit numeric,
+    total_kredit numeric,
+    saldo_awal_debit numeric,
+    saldo_awal_kredit numeric
+)
+language sql
+stable
+as $$
+    with baris as (
+        -- 1. Jurnal umum (kolom lines berisi array JSON)
+        select
+            l ->> 'account_code' as account_code,
+            l ->> 'account_name' as account_name,
+            coalesce(nullif(l ->> 'debit', '')::numeric, 0) as debit,
+            coalesce(nullif(l ->> 'credit', '')::numeric, 0) as kredit,
+            false as dari_saldo_awal,
+            1 as urutan
+        from public.general_journal j
+        cross join lateral jsonb_array_elements(
+            case when jsonb_typeof(j.lines::jsonb) = 'array' then j.lines::jsonb else '[]'::jsonb end
+        ) as l
+        where j.user_email = p_user_email
+
+        union all
+
+        -- 2. Jurnal penyesuaian (tidak ikut pada tahap sebelum penyesuaian)
+        select
+            a.ref,
+            a.description,
+            coalesce(a.debit, 0),
+            coalesce(a.credit, 0),
+            false,
+            2
+        from public.adjustment_journal a
+        where a.user_email = p_user_email
+          and coalesce(a.ref, '') <> ''
+          and p_tahap <> 'sebelum_penyesuaian'
+
+        union all
+
+        -- 3. Saldo awal
+        select
+            o.account_code,
+            o.account_name,
+            coalesce(o.debit, 0),
+            coalesce(o.credit, 0),
+            true,
+            3
+        from public.opening_balance o
+    ),
+    rekap as (
+        select
+            b.account_code,
+            (array_agg(b.account_name order by b.urutan))[1] as account_name,
+            sum(b.debit) as total_debit,
+            sum(b.kredit) as total_kredit,
+            sum(case when b.dari_saldo_awal then b.debit else 0 end) as saldo_awal_debit,
+            sum(case when b.dari_saldo_awal then b.kredit else 0 end) as saldo_awal_kredit
+        from baris b
+        where b.account_code is not null
+        group by b.account_code
+    ),
+    penutupan as (
+        select
+            coalesce(sum(case when r.account_code ~ '^[45689]-' then r.total_kredit - r.total_debit end), 0) as laba_rugi,
+            coalesce(sum(case when r.account_code = '3-1200' then r.total_debit - r.total_kredit end), 0) as prive
+        from rekap r
+    )
+    select
+        r.account_code,
+        r.account_name,
+        r.total_debit + case when p_tahap = 'setelah_penutupan' and r.account_code = '3-1100'
+                             then p.prive + greatest(-p.laba_rugi, 0) else 0 end,
+        r.total_kredit + case when p_tahap = 'setelah_penutupan' and r.account_code = '3-1100'
+                              then greatest(p.laba_rugi, 0) else 0 end,
+        r.saldo_awal_debit,
+        r.saldo_awal_kredit
+    from rekap r
+    cross join penutupan p
+    where p_tahap <> 'setelah_penutupan'
+       or not (r.account_code ~ '^[45689]-' or r.account_code = '3-1200')
+    order by r.account_code;
+$$;
+
+grant execute on function public.rekap_saldo_akun(text, text) to anon, authenticated;
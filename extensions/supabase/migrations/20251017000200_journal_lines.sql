@@ -0,0 +1,185 @@
+-- =======================================
+-- TABEL journal_lines (baris debit/kredit jurnal umum)
+-- =======================================
+-- Menggantikan array JSON di kolom general_journal.lines. Satu baris per
+-- akun per jurnal, sehingga database bisa memfilter dan menjumlah per akun
+-- dan per rentang tanggal memakai index.
+
+create table if not exists public.journal_lines (
+    id bigserial primary key,
+    journal_id bigint not null references public.general_journal (id) on delete cascade,
+    user_email text not null,
+    date date,
+    line_no smallint not null default 1,
+    account_code text not null,
+    account_name text,
+    debit numeric not null default 0,
+    credit numeric not null default 0
+);
+
+-- Buku besar / neraca saldo per akun & rentang tanggal
+create index if not exists journal_lines_user_akun_tanggal_idx
+    on public.journal_lines (user_email, account_code, date);
+
+-- Daftar jurnal per user berurutan tanggal (halaman /jurnal)
+create index if not exists journal_lines_user_tanggal_idx
+    on public.journal_lines (user_email, date, journal_id, line_no);
+
+-- Embed baris ke header (histori) & cascade delete
+create index if not exists journal_lines_journal_idx
+    on public.journal_lines (journal_id);
+
+-- ---------------------------
+-- MIGRASI DATA LAMA
+-- ---------------------------
+insert into public.journal_lines (journal_id, user_email, date, line_no, account_code, account_name, debit, credit)
+select
+    j.id,
+    j.user_email,
+    j.date,
+    l.no,
+    l.baris ->> 'account_code',
+    l.baris ->> 'account_name',
+    coalesce(nullif(l.baris ->> 'debit', '')::numeric, 0),
+    coalesce(nullif(l.baris ->> 'credit', '')::numeric, 0)
+from public.general_journal j
+cross join lateral jsonb_array_elements(
+    case when jsonb_typeof(j.lines::jsonb) = 'array' then j.lines::jsonb else '[]'::jsonb end
+) with ordinality as l (baris, no)
+where j.user_email is not null
+  and l.baris ->> 'account_code' is not null
+  and not exists (select 1 from public.journal_lines x where x.journal_id = j.id);
+
+-- Kolom lines tidak lagi ditulis oleh aplikasi
+alter table public.general_journal alter column lines drop not null;
+
+-- ---------------------------
+-- SIMPAN JURNAL (header + baris dalam satu transaksi)
+-- ---------------------------
+create or replace function public.simpan_jurnal(
+    p_user_email text,
+    p_date date,
+    p_description text,
+    p_lines jsonb
+)
+returns bigint
+language plpgsql
+as $$
+declare
+    v_id bigint;
+begin
+    insert into public.general_journal (description, date, user_email, created_at)
+    values (p_description, p_date, p_user_email, now())
+    returning id into v_id;
+
+    insert into public.journal_lines (journal_id, user_email, date, line_no, account_code, account_name, debit, credit)
+    select
+        v_id,
+        p_user_email,
+        p_date,
+        l.no,
+        l.baris ->> 'account_code',
+        l.baris ->> 'account_name',
+        coalesce(nullif(l.baris ->> 'debit', '')::numeric, 0),
+        coalesce(nullif(l.baris ->> 'credit', '')::numeric, 0)
+    from jsonb_array_elements(p_lines) with ordinality as l (baris, no);
+
+    return v_id;
+end;
+$$;
+
+grant execute on function public.simpan_jurnal(text, date, text, jsonb) to anon, authenticated;
+grant select, insert, delete on public.journal_lines to anon, authenticated;
+grant usage on sequence public.journal_lines_id_seq to anon, authenticated;
+
+-- ---------------------------
+-- REKAP SALDO PER AKUN: baca dari journal_lines
+-- ---------------------------
+create or replace function public.rekap_saldo_akun(
+    p_user_email text,
+    p_tahap text default 'setelah_penyesuaian'
+)
+returns table (
+    account_code text,
+    account_name text,
+    total_debit numeric,
+    total_kredit numeric,
+    saldo_awal_debit numeric,
+    saldo_awal_kredit numeric
+)
+language sql
+stable
+as $$
+    with baris as (
+        -- 1. Jurnal umum (dikelompokkan dulu per akun memakai index user_email, account_code)
+        select
+            l.account_code,
+            min(l.account_name) as account_name,
+            sum(l.debit) as debit,
+            sum(l.credit) as kredit,
+            false as dari_saldo_awal,
+            1 as urutan
+        from public.journal_lines l
+        where l.user_email = p_user_email
+        group by l.account_code
+
+        union all
+
+        -- 2. Jurnal penyesuaian (tidak ikut pada tahap sebelum penyesuaian)
+        select
+            a.ref,
+            a.description,
+            coalesce(a.debit, 0),
+            coalesce(a.credit, 0),
+            false,
+            2
+        from public.adjustment_journal a
+        where a.user_email = p_user_email
+          and coalesce(a.ref, '') <> ''
+          and p_tahap <> 'sebelum_penyesuaian'
+
+        union all
+
+        -- 3. Saldo awal
+        select
+            o.account_code,
+            o.account_name,
+            coalesce(o.debit, 0),
+            coalesce(o.credit, 0),
+            true,
+            3
+        from public.opening_balance o
+    ),
+    rekap as (
+        select
+            b.account_code,
+            (array_agg(b.account_name order by b.urutan))[1] as account_name,
+            sum(b.debit) as total_debit,
+            sum(b.kredit) as total_kredit,
+            sum(case when b.dari_saldo_awal then b.debit else 0 end) as saldo_awal_debit,
+            sum(case when b.dari_saldo_awal then b.kredit else 0 end) as saldo_awal_kredit
+        from baris b
+        where b.account_code is not null
+        group by b.account_code
+    ),
+    penutupan as (
+        select
+            coalesce(sum(case when r.account_code ~ '^[45689]-' then r.total_kredit - r.total_debit end), 0) as laba_rugi,
+            coalesce(sum(case when r.account_code = '3-1200' then r.total_debit - r.total_kredit end), 0) as prive
+        from rekap r
+    )
+    select
+        r.account_code,
+        r.account_name,
+        r.total_debit + case when p_tahap = 'setelah_penutupan' and r.account_code = '3-1100'
+                             then p.prive + greatest(-p.laba_rugi, 0) else 0 end,
+        r.total_kredit + case when p_tahap = 'setelah_penutupan' and r.account_code = '3-1100'
+                              then greatest(p.laba_rugi, 0) else 0 end,
+        r.saldo_awal_debit,
+        r.saldo_awal_kredit
+    from rekap r
+    cross join penutupan p
+    where p_tahap <> 'setelah_penutupan'
+       or not (r.account_code ~ '^[45689]-' or r.account_code = '3-1200')
+    order by r.account_code;
+$$;
@@ -0,0 +1,201 @@
+-- =======================================
+-- TABEL account_balances (saldo per akun yang selalu ter-update)
+-- =======================================
+-- Satu baris per (user_email, account_code, stage). Diperbarui oleh trigger
+-- di transaksi yang sama dengan setiap insert/delete pada:
+--   journal_lines      -> stage 'umum'         (simpan_jurnal_auto, histori delete/reset_all
+--                                               lewat cascade dari general_journal)
+--   adjustment_journal -> stage 'penyesuaian'  (jurnal_penyesuaian_input, jurnal_penyesuaian_view delete)
+--   opening_balance    -> stage 'saldo_awal'   (saldo_awal insert, delete_one, reset_all)
+-- Laporan cukup membaca O(jumlah akun) baris, berapa pun panjang histori user.
+
+create table if not exists public.account_balances (
+    user_email text not null,
+    account_code text not null,
+    stage text not null check (stage in ('umum', 'penyesuaian', 'saldo_awal')),
+    account_name text,
+    total_debit numeric not null default 0,
+    total_kredit numeric not null default 0,
+    jumlah_baris integer not null default 0,
+    primary key (user_email, account_code, stage)
+);
+
+grant select on public.account_balances to anon, authenticated;
+
+-- ---------------------------
+-- FUNGSI BANTU: tambah/kurangi saldo satu akun
+-- ---------------------------
+create or replace function public.ubah_account_balance(
+    p_user_email text,
+    p_account_code text,
+    p_stage text,
+    p_account_name text,
+    p_debit numeric,
+    p_kredit numeric,
+    p_arah integer
+)
+returns void
+language plpgsql
+as $$
+begin
+    if p_account_code is null or p_account_code = '' then
+        return;
+    end if;
+
+    insert into public.account_balances as ab
+        (user_email, account_code, stage, account_name, total_debit, total_kredit, jumlah_baris)
+    values (
+        coalesce(p_user_email, ''), p_account_code, p_stage, p_account_name,
+        p_arah * coalesce(p_debit, 0), p_arah * coalesce(p_kredit, 0), p_arah
+    )
+    on conflict (user_email, account_code, stage) do update set
+        account_name = coalesce(ab.account_name, excluded.account_name),
+        total_debit = ab.total_debit + excluded.total_debit,
+        total_kredit = ab.total_kredit + excluded.total_kredit,
+        jumlah_baris = ab.jumlah_baris + excluded.jumlah_baris;
+
+    -- Akun tanpa baris tersisa dihapus agar tidak muncul sebagai saldo 0 di laporan
+    if p_arah < 0 then
+        delete from public.account_balances
+        where user_email = coalesce(p_user_email, '')
+          and account_code = p_account_code
+          and stage = p_stage
+          and jumlah_baris <= 0;
+    end if;
+end;
+$$;
+
+-- ---------------------------
+-- TRIGGER
+-- ---------------------------
+create or replace function public.trg_account_balances()
+returns trigger
+language plpgsql
+as $$
+declare
+    v_stage text := tg_argv[0];
+begin
+    if tg_op in ('DELETE', 'UPDATE') then
+        if v_stage = 'penyesuaian' then
+            perform public.ubah_account_balance(old.user_email, old.ref, v_stage, old.description, old.debit, old.credit, -1);
+        elsif v_stage = 'saldo_awal' then
+            perform public.ubah_account_balance(null, old.account_code, v_stage, old.account_name, old.debit, old.credit, -1);
+        else
+            perform public.ubah_account_balance(old.user_email, old.account_code, v_stage, old.account_name, old.debit, old.credit, -1);
+        end if;
+    end if;
+
+    if tg_op in ('INSERT', 'UPDATE') then
+        if v_stage = 'penyesuaian' then
+            perform public.ubah_account_balance(new.user_email, new.ref, v_stage, new.description, new.debit, new.credit, 1);
+        elsif v_stage = 'saldo_awal' then
+            perform public.ubah_account_balance(null, new.account_code, v_stage, new.account_name, new.debit, new.credit, 1);
+        else
+            perform public.ubah_account_balance(new.user_email, new.account_code, v_stage, new.account_name, new.debit, new.credit, 1);
+        end if;
+    end if;
+
+    return null;
+end;
+$$;
+
+drop trigger if exists journal_lines_account_balances on public.journal_lines;
+create trigger journal_lines_account_balances
+    after insert or update or delete on public.journal_lines
+    for each row execute function public.trg_account_balances('umum');
+
+drop trigger if exists adjustment_journal_account_balances on public.adjustment_journal;
+create trigger adjustment_journal_account_balances
+    after insert or update or delete on public.adjustment_journal
+    for each row execute function public.trg_account_balances('penyesuaian');
+
+drop trigger if exists opening_balance_account_balances on public.opening_balance;
+create trigger opening_balance_account_balances
+    after insert or update or delete on public.opening_balance
+    for each row execute function public.trg_account_balances('saldo_awal');
+
+-- ---------------------------
+-- ISI AWAL DARI DATA YANG SUDAH ADA
+-- ---------------------------
+truncate public.account_balances;
+
+insert into public.account_balances (user_email, account_code, stage, account_name, total_debit, total_kredit, jumlah_baris)
+select user_email, account_code, 'umum', min(account_name), sum(debit), sum(credit), count(*)
+from public.journal_lines
+group by user_email, account_code;
+
+insert into public.account_balances (user_email, account_code, stage, account_name, total_debit, total_kredit, jumlah_baris)
+select user_email, ref, 'penyesuaian', min(description), sum(coalesce(debit, 0)), sum(coalesce(credit, 0)), count(*)
+from public.adjustment_journal
+where user_email is not null and coalesce(ref, '') <> ''
+group by user_email, ref;
+
+insert into public.account_balances (user_email, account_code, stage, account_name, total_debit, total_kredit, jumlah_baris)
+select '', account_code, 'saldo_awal', min(account_name), sum(coalesce(debit, 0)), sum(coalesce(credit, 0)), count(*)
+from public.opening_balance
+where coalesce(account_code, '') <> ''
+group by account_code;
+
+-- ---------------------------
+-- REKAP SALDO PER AKUN: baca dari account_balances
+-- ---------------------------
+create or replace function public.rekap_saldo_akun(
+    p_user_email text,
+    p_tahap text default 'setelah_penyesuaian'
+)
+returns table (
+    account_code text,
+    account_name text,
+    total_debit numeric,
+    total_kredit numeric,
+    saldo_awal_debit numeric,
+    saldo_awal_kredit numeric
+)
+language sql
+stable
+as $$
+    with baris as (
+        select
+            ab.account_code,
+            ab.account_name,
+            ab.total_debit as debit,
+            ab.total_kredit as kredit,
+            ab.stage = 'saldo_awal' as dari_saldo_awal,
+            case ab.stage when 'umum' then 1 when 'penyesuaian' then 2 else 3 end as urutan
+        from public.account_balances ab
+        where (ab.stage = 'umum' and ab.user_email = p_user_email)
+           or (ab.stage = 'penyesuaian' and ab.user_email = p_user_email and p_tahap <> 'sebelum_penyesuaian')
+           or ab.stage = 'saldo_awal'
+    ),
+    rekap as (
+        select
+            b.account_code,
+            (array_agg(b.account_name order by b.urutan))[1] as account_name,
+            sum(b.debit) as total_debit,
+            sum(b.kredit) as total_kredit,
+            sum(case when b.dari_saldo_awal then b.debit else 0 end) as saldo_awal_debit,
+            sum(case when b.dari_saldo_awal then b.kredit else 0 end) as saldo_awal_kredit
+        from baris b
+        group by b.account_code
+    ),
+    penutupan as (
+        select
+            coalesce(sum(case when r.account_code ~ '^[45689]-' then r.total_kredit - r.total_debit end), 0) as laba_rugi,
+            coalesce(sum(case when r.account_code = '3-1200' then r.total_debit - r.total_kredit end), 0) as prive
+        from rekap r
+    )
+    select
+        r.account_code,
+        r.account_name,
+        r.total_debit + case when p_tahap = 'setelah_penutupan' and r.account_code = '3-1100'
+                             then p.prive + greatest(-p.laba_rugi, 0) else 0 end,
+        r.total_kredit + case when p_tahap = 'setelah_penutupan' and r.account_code = '3-1100'
+                              then greatest(p.laba_rugi, 0) else 0 end,
+        r.saldo_awal_debit,
+        r.saldo_awal_kredit
+    from rekap r
+    cross join penutupan p
+    where p_tahap <> 'setelah_penutupan'
+       or not (r.account_code ~ '^[45689]-' or r.account_code = '3-1200')
+    order by r.account_code;
+$$;
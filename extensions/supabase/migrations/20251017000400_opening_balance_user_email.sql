@@ -0,0 +1,116 @@
+-- =======================================
+-- SALDO AWAL PER USER
+-- =======================================
+-- opening_balance sebelumnya tidak punya pemilik, sehingga setiap user
+-- mengunduh saldo awal semua user. Sekarang setiap baris membawa user_email,
+-- dibaca dan dihapus dengan filter user_email memakai index.
+--
+-- Baris lama (user_email masih null) tidak lagi muncul di laporan siapa pun.
+-- Tetapkan pemiliknya secara manual sebelum/ sesudah migrasi, contoh:
+--   update public.opening_balance set user_email = 'pemilik@contoh.com' where user_email is null;
+
+alter table public.opening_balance add column if not exists user_email text;
+
+create index if not exists opening_balance_user_akun_idx
+    on public.opening_balance (user_email, account_code);
+
+-- ---------------------------
+-- TRIGGER account_balances: saldo awal kini per user
+-- ---------------------------
+create or replace function public.trg_account_balances()
+returns trigger
+language plpgsql
+as $$
+declare
+    v_stage text := tg_argv[0];
+begin
+    if tg_op in ('DELETE', 'UPDATE') then
+        if v_stage = 'penyesuaian' then
+            perform public.ubah_account_balance(old.user_email, old.ref, v_stage, old.description, old.debit, old.credit, -1);
+        else
+            perform public.ubah_account_balance(old.user_email, old.account_code, v_stage, old.account_name, old.debit, old.credit, -1);
+        end if;
+    end if;
+
+    if tg_op in ('INSERT', 'UPDATE') then
+        if v_stage = 'penyesuaian' then
+            perform public.ubah_account_balance(new.user_email, new.ref, v_stage, new.description, new.debit, new.credit, 1);
+        else
+            perform public.ubah_account_balance(new.user_email, new.account_code, v_stage, new.account_name, new.debit, new.credit, 1);
+        end if;
+    end if;
+
+    return null;
+end;
+$$;
+
+delete from public.account_balances where stage = 'saldo_awal';
+
+insert into public.account_balances (user_email, account_code, stage, account_name, total_debit, total_kredit, jumlah_baris)
+select coalesce(user_email, ''), account_code, 'saldo_awal', min(account_name), sum(coalesce(debit, 0)), sum(coalesce(credit, 0)), count(*)
+from public.opening_balance
+where coalesce(account_code, '') <> ''
+group by coalesce(user_email, ''), account_code;
+
+-- ---------------------------
+-- REKAP SALDO PER AKUN: saldo awal milik user saja
+-- ---------------------------
+create or replace function public.rekap_saldo_akun(
+    p_user_email text,
+    p_tahap text default 'setelah_penyesuaian'
+)
+returns table (
+    account_code text,
+    account_name text,
+    total_debit numeric,
+    total_kredit numeric,
+    saldo_awal_debit numeric,
+    saldo_awal_kredit numeric
+)
+language sql
+stable
+as $$
+    with baris as (
+        select
+            ab.account_code,
+            ab.account_name,
+            ab.total_debit as debit,
+            ab.total_kredit as kredit,
+            ab.stage = 'saldo_awal' as dari_saldo_awal,
+            case ab.stage when 'umum' then 1 when 'penyesuaian' then 2 else 3 end as urutan
+        from public.account_balances ab
+        where ab.user_email = p_user_email
+          and (ab.stage <> 'penyesuaian' or p_tahap <> 'sebelum_penyesuaian')
+    ),
+    rekap as (
+        select
+            b.account_code,
+            (array_agg(b.account_name order by b.urutan))[1] as account_name,
+            sum(b.debit) as total_debit,
+            sum(b.kredit) as total_kredit,
+            sum(case when b.dari_saldo_awal then b.debit else 0 end) as saldo_awal_debit,
+            sum(case when b.dari_saldo_awal then b.kredit else 0 end) as saldo_awal_kredit
+        from baris b
+        group by b.account_code
+    ),
+    penutupan as (
+        select
+            coalesce(sum(case when r.account_code ~ '^[45689]-' then r.total_kredit - r.total_debit end), 0) as laba_rugi,
+            coalesce(sum(case when r.account_code = '3-1200' then r.total_debit - r.total_kredit end), 0) as prive
+        from rekap r
+    )
+    select
+        r.account_code,
+        r.account_name,
+        r.total_debit + case when p_tahap = 'setelah_penutupan' and r.account_code = '3-1100'
+                             then p.prive + greatest(-p.laba_rugi, 0) else 0 end,
+        r.total_kredit + case when p_tahap = 'setelah_penutupan' and r.account_code = '3-1100'
+                              then greatest(p.laba_rugi, 0) else 0 end,
+        r.saldo_awal_debit,
+        r.saldo_awal_kredit
+    from rekap r
+    cross join penutupan p
+    where p_tahap <> 'setelah_penutupan'
+       or not (r.account_code ~ '^[45689]-' or r.account_code = '3-1200')
+    order by r.account_code;
+$$;
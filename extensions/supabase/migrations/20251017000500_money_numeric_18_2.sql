@@ -0,0 +1,49 @@
+-- =======================================
+-- NOMINAL UANG: numeric(18,2)
+-- =======================================
+-- Aplikasi menghitung semua nominal sebagai bilangan bulat sen. Kolom uang
+-- disimpan sebagai fixed-point 2 desimal supaya nilai yang dibaca kembali
+-- selalu tepat satu sen (tidak ada lagi pecahan seperti 52083.3333...).
+-- Nilai lama dibulatkan ke sen terdekat, lalu account_balances dibangun ulang
+-- karena ALTER TABLE tidak menjalankan trigger.
+
+alter table public.journal_lines
+    alter column debit type numeric(18,2) using round(debit, 2),
+    alter column credit type numeric(18,2) using round(credit, 2);
+
+alter table public.adjustment_journal
+    alter column debit type numeric(18,2) using round(debit, 2),
+    alter column credit type numeric(18,2) using round(credit, 2);
+
+alter table public.opening_balance
+    alter column debit type numeric(18,2) using round(debit, 2),
+    alter column credit type numeric(18,2) using round(credit, 2);
+
+alter table public.transactions
+    alter column amount type numeric(18,2) using round(amount, 2);
+
+alter table public.account_balances
+    alter column total_debit type numeric(18,2),
+    alter column total_kredit type numeric(18,2);
+
+-- ---------------------------
+-- BANGUN ULANG account_balances DARI NILAI YANG SUDAH DIBULATKAN
+-- ---------------------------
+truncate public.account_balances;
+
+insert into public.account_balances (user_email, account_code, stage, account_name, total_debit, total_kredit, jumlah_baris)
+select user_email, account_code, 'umum', min(account_name), sum(debit), sum(credit), count(*)
+from public.journal_lines
+group by user_email, account_code;
+
+insert into public.account_balances (user_email, account_code, stage, account_name, total_debit, total_kredit, jumlah_baris)
+select user_email, ref, 'penyesuaian', min(description), sum(coalesce(debit, 0)), sum(coalesce(credit, 0)), count(*)
+from public.adjustment_journal
+where user_email is not null and coalesce(ref, '') <> ''
+group by user_email, ref;
+
+insert into public.account_balances (user_email, account_code, stage, account_name, total_debit, total_kredit, jumlah_baris)
+select coalesce(user_email, ''), account_code, 'saldo_awal', min(account_name), sum(coalesce(debit, 0)), sum(coalesce(credit, 0)), count(*)
+from public.opening_balance
+where coalesce(account_code, '') <> ''
+group by coalesce(user_email, ''), account_code;
@@ -0,0 +1,79 @@
+-- =======================================
+-- TABEL ledger_versions (versi data ledger per user)
+-- =======================================
+-- Satu baris per user; kolom versi naik di transaksi yang sama dengan setiap
+-- perubahan journal_lines, adjustment_journal atau opening_balance (lewat
+-- trigger account_balances yang sudah ada). Aplikasi membaca versi ini satu
+-- kali per request untuk memutuskan apakah laporan di cache masih berlaku,
+-- sehingga semua worker/host melihat penulisan worker lain.
+--
+-- Setiap kenaikan versi juga mengirim NOTIFY di channel 'ledger_versions'
+-- (payload = user_email) untuk subscriber yang memakai LISTEN.
+
+create table if not exists public.ledger_versions (
+    user_email text primary key,
+    versi bigint not null default 0,
+    diubah_at timestamptz not null default now()
+);
+
+grant select on public.ledger_versions to anon, authenticated;
+
+create or replace function public.naikkan_versi_ledger(p_user_email text)
+returns void
+language plpgsql
+as $$
+begin
+    insert into public.ledger_versions as lv (user_email, versi, diubah_at)
+    values (coalesce(p_user_email, ''), 1, now())
+    on conflict (user_email) do update set
+        versi = lv.versi + 1,
+        diubah_at = now();
+
+    perform pg_notify('ledger_versions', coalesce(p_user_email, ''));
+end;
+$$;
+
+-- ---------------------------
+-- ubah_account_balance: setiap perubahan saldo menaikkan versi ledger user
+-- ---------------------------
+create or replace function public.ubah_account_balance(
+    p_user_email text,
+    p_account_code text,
+    p_stage text,
+    p_account_name text,
+    p_debit numeric,
+    p_kredit numeric,
+    p_arah integer
+)
+returns void
+language plpgsql
+as $$
+begin
+    perform public.naikkan_versi_ledger(p_user_email);
+
+    if p_account_code is null or p_account_code = '' then
+        return;
+    end if;
+
+    insert into public.account_balances as ab
+        (user_email, account_code, stage, account_name, total_debit, total_kredit, jumlah_baris)
+    values (
+        coalesce(p_user_email, ''), p_account_code, p_stage, p_account_name,
+        p_arah * coalesce(p_debit, 0), p_arah * coalesce(p_kredit, 0), p_arah
+    )
+    on conflict (user_email, account_code, stage) do update set
+        account_name = coalesce(ab.account_name, excluded.account_name),
+        total_debit = ab.total_debit + excluded.total_debit,
+        total_kredit = ab.total_kredit + excluded.total_kredit,
+        jumlah_baris = ab.jumlah_baris + excluded.jumlah_baris;
+
+    -- Akun tanpa baris tersisa dihapus agar tidak muncul sebagai saldo 0 di laporan
+    if p_arah < 0 then
+        delete from public.account_balances
+        where user_email = coalesce(p_user_email, '')
+          and account_code = p_account_code
+          and stage = p_stage
+          and jumlah_baris <= 0;
+    end if;
+end;
+$$;
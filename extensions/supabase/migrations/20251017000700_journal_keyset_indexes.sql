@@ -0,0 +1,19 @@
+-- =======================================
+-- INDEX HALAMAN /jurnal DAN /histori
+-- =======================================
+-- Kedua halaman membaca general_journal per user dengan keyset (date, id),
+-- naik untuk /jurnal dan turun untuk /histori, sehingga satu halaman selalu
+-- berupa satu index range scan sepanjang ukuran halaman.
+
+create index if not exists general_journal_user_tanggal_id_idx
+    on public.general_journal (user_email, date, id);
+
+-- Filter "cari keterangan" (ilike '%teks%') memakai trigram index
+create extension if not exists pg_trgm;
+
+create index if not exists general_journal_keterangan_trgm_idx
+    on public.general_journal using gin (description gin_trgm_ops);
+
+-- Filter nominal: jurnal yang punya baris debit dalam rentang tertentu
+create index if not exists journal_lines_journal_debit_idx
+    on public.journal_lines (journal_id, debit);
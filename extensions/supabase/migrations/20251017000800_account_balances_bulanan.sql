@@ -0,0 +1,146 @@
+-- =======================================
+-- TABEL account_balances_bulanan (saldo per akun per bulan)
+-- =======================================
+-- Sama seperti account_balances, tetapi dipisah per bulan tanggal transaksi.
+-- Dashboard membaca penjualan dan laba bulan berjalan dari beberapa baris
+-- ini, berapa pun panjang histori user. Diperbarui trigger di transaksi yang
+-- sama dengan insert/update/delete pada journal_lines (stage 'umum') dan
+-- adjustment_journal (stage 'penyesuaian').
+
+create table if not exists public.account_balances_bulanan (
+    user_email text not null,
+    bulan date not null,
+    account_code text not null,
+    stage text not null check (stage in ('umum', 'penyesuaian')),
+    account_name text,
+    total_debit numeric(18,2) not null default 0,
+    total_kredit numeric(18,2) not null default 0,
+    jumlah_baris integer not null default 0,
+    primary key (user_email, bulan, account_code, stage)
+);
+
+grant select on public.account_balances_bulanan to anon, authenticated;
+
+-- Tanggal dari kolom teks/date; nilai kosong atau tidak valid dianggap null
+-- (baris tanpa tanggal tidak masuk rekap bulanan, tapi tidak menggagalkan insert)
+create or replace function public.tanggal_atau_null(p_tanggal text)
+returns date
+language plpgsql
+immutable
+as $$
+begin
+    return nullif(p_tanggal, '')::date;
+exception when others then
+    return null;
+end;
+$$;
+
+-- ---------------------------
+-- FUNGSI BANTU: tambah/kurangi saldo bulanan satu akun
+-- ---------------------------
+create or replace function public.ubah_account_balance_bulanan(
+    p_user_email text,
+    p_tanggal date,
+    p_account_code text,
+    p_stage text,
+    p_account_name text,
+    p_debit numeric,
+    p_kredit numeric,
+    p_arah integer
+)
+returns void
+language plpgsql
+as $$
+declare
+    v_bulan date := date_trunc('month', p_tanggal)::date;
+begin
+    if p_user_email is null or p_tanggal is null or p_account_code is null or p_account_code = '' then
+        return;
+    end if;
+
+    insert into public.account_balances_bulanan as ab
+        (user_email, bulan, account_code, stage, account_name, total_debit, total_kredit, jumlah_baris)
+    values (
+        p_user_email, v_bulan, p_account_code, p_stage, p_account_name,
+        p_arah * coalesce(p_debit, 0), p_arah * coalesce(p_kredit, 0), p_arah
+    )
+    on conflict (user_email, bulan, account_code, stage) do update set
+        account_name = coalesce(ab.account_name, excluded.account_name),
+        total_debit = ab.total_debit + excluded.total_debit,
+        total_kredit = ab.total_kredit + excluded.total_kredit,
+        jumlah_baris = ab.jumlah_baris + excluded.jumlah_baris;
+
+    if p_arah < 0 then
+        delete from public.account_balances_bulanan
+        where user_email = p_user_email
+          and bulan = v_bulan
+          and account_code = p_account_code
+          and stage = p_stage
+          and jumlah_baris <= 0;
+    end if;
+end;
+$$;
+
+-- ---------------------------
+-- TRIGGER
+-- ---------------------------
+create or replace function public.trg_account_balances_bulanan()
+returns trigger
+language plpgsql
+as $$
+declare
+    v_stage text := tg_argv[0];
+begin
+    if tg_op in ('DELETE', 'UPDATE') then
+        if v_stage = 'penyesuaian' then
+            perform public.ubah_account_balance_bulanan(old.user_email, public.tanggal_atau_null(old.date::text),
+                old.ref, v_stage, old.description, old.debit, old.credit, -1);
+        else
+            perform public.ubah_account_balance_bulanan(old.user_email, old.date,
+                old.account_code, v_stage, old.account_name, old.debit, old.credit, -1);
+        end if;
+    end if;
+
+    if tg_op in ('INSERT', 'UPDATE') then
+        if v_stage = 'penyesuaian' then
+            perform public.ubah_account_balance_bulanan(new.user_email, public.tanggal_atau_null(new.date::text),
+                new.ref, v_stage, new.description, new.debit, new.credit, 1);
+        else
+            perform public.ubah_account_balance_bulanan(new.user_email, new.date,
+                new.account_code, v_stage, new.account_name, new.debit, new.credit, 1);
+        end if;
+    end if;
+
+    return null;
+end;
+$$;
+
+drop trigger if exists journal_lines_account_balances_bulanan on public.journal_lines;
+create trigger journal_lines_account_balances_bulanan
+    after insert or update or delete on public.journal_lines
+    for each row execute function public.trg_account_balances_bulanan('umum');
+
+drop trigger if exists adjustment_journal_account_balances_bulanan on public.adjustment_journal;
+create trigger adjustment_journal_account_balances_bulanan
+    after insert or update or delete on public.adjustment_journal
+    for each row execute function public.trg_account_balances_bulanan('penyesuaian');
+
+-- ---------------------------
+-- ISI AWAL DARI DATA YANG SUDAH ADA
+-- ---------------------------
+truncate public.account_balances_bulanan;
+
+insert into public.account_balances_bulanan (user_email, bulan, account_code, stage, account_name, total_debit, total_kredit, jumlah_baris)
+select user_email, date_trunc('month', date)::date, account_code, 'umum', min(account_name), sum(debit), sum(credit), count(*)
+from public.journal_lines
+where date is not null
+group by user_email, date_trunc('month', date)::date, account_code;
+
+insert into public.account_balances_bulanan (user_email, bulan, account_code, stage, account_name, total_debit, total_kredit, jumlah_baris)
+select user_email, date_trunc('month', public.tanggal_atau_null(date::text))::date, ref, 'penyesuaian',
+       min(description), sum(coalesce(debit, 0)), sum(coalesce(credit, 0)), count(*)
+from public.adjustment_journal
+where user_email is not null
+  and coalesce(ref, '') <> ''
+  and public.tanggal_atau_null(date::text) is not null
+group by user_email, date_trunc('month', public.tanggal_atau_null(date::text))::date, ref;
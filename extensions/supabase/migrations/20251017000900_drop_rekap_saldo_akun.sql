@@ -0,0 +1,10 @@
+-- =======================================
+-- HAPUS FUNGSI rekap_saldo_akun
+-- =======================================
+-- Aplikasi membaca saldo per akun langsung dari tabel account_balances
+-- (dipelihara trigger, lihat 20251017000300_account_balances.sql), dan saat
+-- tabel itu belum ada menghitung dari jurnal. Tidak ada lagi yang memanggil
+-- rekap_saldo_akun lewat RPC, jadi fungsinya dihapus agar tidak ada dua
+-- sumber saldo yang bisa berbeda.
+
+drop function if exists public.rekap_saldo_akun(text, text);
@@ -0,0 +1,31 @@
+-- =======================================
+-- REKAP SALDO PER AKUN (dipanggil via supabase.rpc), dari account_balances
+-- =======================================
+-- Menggantikan penghapusan di 20251017000900_drop_rekap_saldo_akun.sql: total
+-- per akun kembali dihitung di Postgres lewat satu fungsi, tetapi kali ini
+-- hanya membaca account_balances (dipelihara trigger, lihat
+-- 20251017000300_account_balances.sql) sehingga tidak ada sumber saldo kedua
+-- yang bisa berbeda. Satu baris per akun per sumber (stage), urut
+-- (account_code, stage), sama dengan PenyimpananSupabase.saldo_akun;
+-- penyesuaian dan penutupan tetap dihitung di Ledger aplikasi.
+
+drop function if exists public.rekap_saldo_akun(text, text);
+
+create or replace function public.rekap_saldo_akun(p_user_email text)
+returns table (
+    account_code text,
+    account_name text,
+    stage text,
+    total_debit numeric,
+    total_kredit numeric
+)
+language sql
+stable
+as $$
+    select ab.account_code, ab.account_name, ab.stage, ab.total_debit, ab.total_kredit
+    from public.account_balances ab
+    where ab.user_email = p_user_email
+    order by ab.account_code, ab.stage;
+$$;
+
+grant execute on function public.rekap_saldo_akun(text) to anon, authenticated;
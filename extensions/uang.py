@@ -0,0 +1,90 @@
+# ---------------------------
+# UANG (RUPIAH DALAM SEN)
+# ---------------------------
+# Semua nominal di aplikasi dihitung sebagai bilangan bulat sen (1 rupiah = 100 sen)
+# supaya penjumlahan selalu pasti dan tidak ada selisih pembulatan float.
+# Nilai dari form atau database diubah ke sen satu kali saat dibaca,
+# lalu diubah kembali ke rupiah (2 desimal) saat disimpan.
+from decimal import Decimal, ROUND_HALF_UP, InvalidOperation
+
+SEN_PER_RUPIAH = 100
+
+# Kolom nominal di database bertipe numeric(18,2): nilai absolutnya harus di
+# bawah 10^16 rupiah (10^18 sen)
+BATAS_RUPIAH = 10 ** 16
+BATAS_SEN = BATAS_RUPIAH * SEN_PER_RUPIAH
+
+def ke_desimal(nilai, jenis="Angka"):
+    """
+    Parse angka (int, float, Decimal, atau string dari form/JSON) ke Decimal.
+    Ditolak dengan ValueError: teks bukan angka, inf/nan, dan nilai yang tidak
+    muat di numeric(18,2). Eksponen diperiksa sebelum dihitung, jadi input
+    seperti '1e500000' tidak pernah diubah menjadi bilangan raksasa.
+    """
+    try:
+        # str() untuk float memberi representasi desimal terpendek (0.1 -> "0.1")
+        angka = nilai if isinstance(nilai, Decimal) else Decimal(str(nilai).strip())
+    except InvalidOperation:
+        raise ValueError(f"{jenis} tidak valid: {nilai!r}")
+    if not angka.is_finite():
+        raise ValueError(f"{jenis} tidak valid: {nilai!r}")
+    if angka and angka.adjusted() >= 16:
+        raise ValueError(f"{jenis} terlalu besar: {nilai!r}")
+    return angka
+
+def _cek_batas_sen(sen, nilai):
+    if abs(sen) >= BATAS_SEN:
+        raise ValueError(f"Nominal terlalu besar: {nilai!r}")
+    return sen
+
+def ke_sen(nilai):
+    """
+    Ubah nilai rupiah (int, float, Decimal, atau string dari form/JSON) ke sen.
+    Pecahan di bawah 1 sen dibulatkan setengah ke atas; kosong/None dianggap 0.
+    Nilai yang bukan angka berhingga atau tidak muat di numeric(18,2) -> ValueError.
+    """
+    if nilai is None or nilai == "":
+        return 0
+    if isinstance(nilai, int):
+        return _cek_batas_sen(nilai * SEN_PER_RUPIAH, nilai)
+    rupiah = ke_desimal(nilai, "Nominal")
+    sen = int((rupiah * SEN_PER_RUPIAH).to_integral_value(rounding=ROUND_HALF_UP))
+    return _cek_batas_sen(sen, nilai)
+
+def bagi_sen(sen, pembagi):
+    """
+    Bagi nominal sen dengan bilangan bulat, dibulatkan setengah ke atas
+    (misal penyusutan per bulan = harga / umur / 12)
+    """
+    hasil, sisa = divmod(abs(sen), pembagi)
+    if sisa * 2 >= pembagi:
+        hasil += 1
+    return hasil if sen >= 0 else -hasil
+
+def kali_sen(sen, jumlah):
+    """
+    Kalikan nominal sen dengan jumlah pecahan (misal kuantitas kg), dibulatkan
+    setengah ke atas ke sen terdekat
+    """
+    hasil = Decimal(sen) * ke_desimal(jumlah)
+    if abs(hasil) >= BATAS_SEN:
+        raise ValueError(f"Nominal terlalu besar: {sen} x {jumlah!r}")
+    return int(hasil.to_integral_value(rounding=ROUND_HALF_UP))
+
+def sen_ke_angka(sen):
+    """
+    Nilai rupiah untuk disimpan (JSON / numeric(18,2)): int jika tidak ada
+    pecahan sen, selain itu Decimal 2 desimal (tidak pernah float)
+    """
+    if sen % SEN_PER_RUPIAH == 0:
+        return sen // SEN_PER_RUPIAH
+    return Decimal(sen).scaleb(-2)
+
+def rupiah_sen(sen):
+    """
+    Format nominal sen ke "Rp 1.234.567" (pecahan rupiah dibuang)
+    """
+    rupiah = abs(sen) // SEN_PER_RUPIAH
+    if sen < 0 and rupiah:
+        rupiah = -rupiah
+    return f"Rp {rupiah:,}".replace(",", ".")
@@ -0,0 +1,71 @@
+"""
+Buat varian gambar untuk extensions/static:
+
+- static/<nama>.webp        : versi WebP dari setiap gambar asli (ukuran sama)
+- static/kecil/<nama>       : thumbnail seukuran tampilan di halaman (2x untuk
+                              layar retina), format sama dengan aslinya
+- static/kecil/<nama>.webp  : versi WebP dari thumbnail
+
+Aplikasi melayani varian .webp otomatis ke browser yang mengirim
+"Accept: image/webp", jadi template cukup menunjuk file png/jpg.
+Script ini hanya dipakai saat gambar berubah (butuh Pillow, tidak perlu di
+server):
+
+    pip install pillow
+    python scripts/buat_varian_gambar.py
+"""
+import os
+from PIL import Image
+
+STATIC = os.path.join(os.path.dirname(__file__), "..", "extensions", "static")
+
+# Sisi terpanjang thumbnail (px) = 2x ukuran tampilan terbesar di CSS halaman
+THUMBNAIL = {
+    "logo_belutin.png": 240,    # 120px di login/OTP, 50px di dashboard
+    "kolam_belut.jpg": 320,     # banner dashboard 160x100
+    "belut_standar.png": 400,   # kartu informasi produk 200x200
+    "belut_super.png": 400,
+}
+
+# kolam_belut.png sebenarnya berisi JPEG; thumbnail disimpan dengan ekstensi yang benar
+SUMBER = {"kolam_belut.jpg": "kolam_belut.png"}
+
+KUALITAS_WEBP = 80
+KUALITAS_JPEG = 82
+
+def simpan(gambar, path):
+    """
+    Simpan gambar sesuai ekstensi path dengan pengaturan kompresi terbaik
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".webp":
+        gambar.save(path, "WEBP", quality=KUALITAS_WEBP, method=6)
+    elif ext in (".jpg", ".jpeg"):
+        gambar.convert("RGB").save(path, "JPEG", quality=KUALITAS_JPEG, optimize=True, progressive=True)
+    else:
+        gambar.save(path, "PNG", optimize=True)
+    print(f"{os.path.relpath(path, STATIC):32} {os.path.getsize(path):>8} byte")
+
+def path_webp(path):
+    return os.path.splitext(path)[0] + ".webp"
+
+def main():
+    os.makedirs(os.path.join(STATIC, "kecil"), exist_ok=True)
+
+    # WebP untuk gambar asli
+    for nama in sorted(os.listdir(STATIC)):
+        path = os.path.join(STATIC, nama)
+        if os.path.isfile(path) and nama.lower().endswith((".png", ".jpg", ".jpeg")):
+            with Image.open(path) as gambar:
+                simpan(gambar, path_webp(path))
+
+    # Thumbnail + WebP-nya
+    for nama, sisi in THUMBNAIL.items():
+        with Image.open(os.path.join(STATIC, SUMBER.get(nama, nama))) as gambar:
+            gambar.thumbnail((sisi, sisi), Image.LANCZOS)
+            tujuan = os.path.join(STATIC, "kecil", nama)
+            simpan(gambar, tujuan)
+            simpan(gambar, path_webp(tujuan))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+# ---------------------------
+# KONFIGURASI PYTEST
+# ---------------------------
+# Modul aplikasi (extensions/) dan PostgREST palsu (benchmarks/) di-import
+# sebagai modul top-level, sama seperti saat aplikasi dan benchmark dijalankan.
+# Aplikasi di-import dengan backend SQLite di folder sementara; test yang butuh
+# data memakai ledger sendiri lewat fixture di bawah.
+import os, sys, tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "extensions"))
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+_folder = tempfile.mkdtemp(prefix="test-belut-")
+os.environ["STORAGE_BACKEND"] = "sqlite"
+os.environ["SQLITE_PATH"] = os.path.join(_folder, "kosong.db")
+os.environ.setdefault("SECRET_KEY", "test")
+os.environ.setdefault("TEMPLATE_CACHE_DIR", _folder)
+
+import pytest
+
+@pytest.fixture(scope="session")
+def app_modul():
+    import belut_in_app
+    return belut_in_app
+
+USER_TEST = "test@belut.id"
+
+@pytest.fixture(params=["sqlite", "postgrest"])
+def backend(request, tmp_path):
+    """
+    Penyimpanan kosong: PenyimpananSQLite langsung, atau PenyimpananSupabase
+    lewat PostgREST palsu (database SQLite yang sama di baliknya)
+    """
+    path = str(tmp_path / "ledger.db")
+    if request.param == "sqlite":
+        from penyimpanan.db_sqlite import PenyimpananSQLite
+        return PenyimpananSQLite(path)
+    from postgrest_palsu import TransportPostgREST, buat_client_palsu
+    from penyimpanan.db_supabase import PenyimpananSupabase
+    return PenyimpananSupabase(buat_client_palsu(TransportPostgREST(path)))
+
+@pytest.fixture
+def client(app_modul, backend, monkeypatch):
+    """
+    Test client yang sudah login sebagai USER_TEST dengan backend di atas
+    """
+    monkeypatch.setattr(app_modul, "penyimpanan", backend)
+    app_modul._cache_laporan.data.clear()
+    c = app_modul.app.test_client()
+    with c.session_transaction() as s:
+        s["user_email"] = USER_TEST
+    return c
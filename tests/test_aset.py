@@ -0,0 +1,42 @@
+def test_versi_aplikasi_ikut_template_modul_dan_aset(app_modul, monkeypatch, tmp_path):
+    asli = app_modul.hitung_versi_aplikasi()
+    assert asli == app_modul._VERSI_APLIKASI
+
+    monkeypatch.setitem(app_modul.SIDIK_ASET, "css/belut.css", "0" * 10)
+    assert app_modul.hitung_versi_aplikasi() != asli
+    monkeypatch.undo()
+
+    # Salinan folder aplikasi dengan satu template / satu modul helper diubah
+    import shutil
+    salinan = tmp_path / "app"
+    shutil.copytree(app_modul.app.root_path, salinan, ignore=shutil.ignore_patterns("static", "__pycache__", "github.*", "uploads"))
+    monkeypatch.setattr(app_modul.app, "root_path", str(salinan))
+    assert app_modul.hitung_versi_aplikasi() == asli
+    for nama in ("templates/_tabel.html", "uang.py", "akun.py", "penyimpanan/__init__.py"):
+        path = salinan / nama
+        isi = path.read_bytes()
+        path.write_bytes(isi + b"\n")
+        assert app_modul.hitung_versi_aplikasi() != asli, nama
+        path.write_bytes(isi)
+
+def test_aset_sidik_saat_ini_immutable(app_modul):
+    c = app_modul.app.test_client()
+    with app_modul.app.test_request_context():
+        url = app_modul.url_aset("css/belut.css")
+    res = c.get(url)
+    assert res.status_code == 200
+    assert res.cache_control.immutable and res.cache_control.max_age == app_modul.UMUR_CACHE_ASET
+
+def test_aset_sidik_lama_dialihkan(app_modul):
+    c = app_modul.app.test_client()
+    with app_modul.app.test_request_context():
+        url = app_modul.url_aset("css/belut.css")
+    res = c.get("/static/css/belut.0123456789.css")
+    assert res.status_code == 302
+    assert res.headers["Location"].endswith(url)
+    assert res.cache_control.no_store and not res.cache_control.immutable
+    assert c.get(res.headers["Location"]).status_code == 200
+
+def test_aset_tidak_ada_404(app_modul):
+    c = app_modul.app.test_client()
+    assert c.get("/static/css/tidak_ada.0123456789.css").status_code == 404
@@ -0,0 +1,34 @@
+from bench_route import MIN_SAMPEL_BANDING, bandingkan
+
+def hasil(**route):
+    return {"ukuran": {"1000": {"route": route}}}
+
+def r(p50, min_ms, query=2, n=20):
+    return {"p50_ms": p50, "min_ms": min_ms, "query": query, "n": n}
+
+def test_lambat_di_p50_dan_min_regresi():
+    regresi, peringatan = bandingkan(hasil(**{"/a": r(100, 90)}), hasil(**{"/a": r(150, 140)}), 0.2)
+    assert len(regresi) == 1 and "/a" in regresi[0] and not peringatan
+
+def test_satu_request_lambat_bukan_regresi():
+    # p50 naik karena gangguan, tapi waktu tercepat tetap: tidak gagal
+    assert bandingkan(hasil(**{"/a": r(100, 90)}), hasil(**{"/a": r(150, 92)}), 0.2) == ([], [])
+
+def test_lantai_absolut_untuk_route_cepat():
+    # 2 ms -> 4 ms = +100%, tapi hanya 2 ms: di bawah lantai default 5 ms
+    assert bandingkan(hasil(**{"/a": r(2, 1.5)}), hasil(**{"/a": r(4, 3.5)}), 0.2) == ([], [])
+    assert bandingkan(hasil(**{"/a": r(2, 1.5)}), hasil(**{"/a": r(4, 3.5)}), 0.2, lantai_ms=1)[0]
+
+def test_sampel_sedikit_hanya_peringatan():
+    regresi, peringatan = bandingkan(hasil(**{"/a": r(100, 90)}),
+                                     hasil(**{"/a": r(150, 140, n=MIN_SAMPEL_BANDING - 1)}), 0.2)
+    assert not regresi and len(peringatan) == 1
+
+def test_query_bertambah_selalu_regresi():
+    regresi, _ = bandingkan(hasil(**{"/a": r(100, 90)}), hasil(**{"/a": r(50, 40, query=3, n=1)}), 0.2)
+    assert regresi == ["1000 /a: query 2 -> 3"]
+
+def test_hasil_lama_tanpa_min_dan_route_baru():
+    lama = hasil(**{"/a": {"p50_ms": 100, "query": 2, "n": 10}})
+    regresi, _ = bandingkan(lama, hasil(**{"/a": r(150, 140), "/baru": r(999, 999)}), 0.2)
+    assert len(regresi) == 1 and "/a" in regresi[0]
@@ -0,0 +1,115 @@
+import pytest
+from werkzeug.datastructures import MultiDict
+
+from conftest import USER_TEST
+
+def isi_jurnal(backend, tanggal_list):
+    """Satu jurnal Kas/Penjualan per tanggal; nominal = urutan x 1000 rupiah"""
+    for i, tanggal in enumerate(tanggal_list, 1):
+        backend.simpan_jurnal(USER_TEST, tanggal, f"jurnal {i}", [
+            {"account_code": "1-1100", "account_name": "Kas", "debit": i * 1000, "credit": 0},
+            {"account_code": "4-1110", "account_name": "Penjualan Belut Standar", "debit": 0, "credit": i * 1000},
+        ])
+
+# Beberapa jurnal di tanggal yang sama: batas halaman jatuh di tengah satu tanggal
+TANGGAL = ["2025-01-01", "2025-01-02", "2025-01-02", "2025-01-02", "2025-01-03",
+           "2025-01-03", "2025-01-05", "2025-01-05", "2025-01-05", "2025-01-09"]
+
+def jelajah(app_modul, saring, ukuran, terbaru_dulu=False):
+    halaman, kursor_list, kursor = [], [], None
+    while True:
+        data, berikutnya = app_modul.ambil_halaman_jurnal(USER_TEST, saring, kursor, terbaru_dulu, ukuran)
+        halaman.append(data)
+        if not berikutnya:
+            return halaman, kursor_list
+        kursor_list.append(berikutnya)
+        kursor = app_modul.baca_kursor_jurnal({"lanjut": berikutnya})
+
+@pytest.mark.parametrize("ukuran", [1, 2, 3, 5, 9, 10, 11])
+@pytest.mark.parametrize("terbaru_dulu", [False, True])
+def test_kursor_tidak_melewatkan_atau_mengulang(app_modul, backend, monkeypatch, ukuran, terbaru_dulu):
+    monkeypatch.setattr(app_modul, "penyimpanan", backend)
+    isi_jurnal(backend, TANGGAL)
+    halaman, _ = jelajah(app_modul, {}, ukuran, terbaru_dulu)
+
+    semua = [j for data in halaman for j in data]
+    kunci = [(j["date"], j["id"]) for j in semua]
+    assert kunci == sorted(kunci, reverse=terbaru_dulu)
+    assert len(set(kunci)) == len(TANGGAL)
+    assert all(len(data) == ukuran for data in halaman[:-1])
+    # Jumlah jurnal kelipatan ukuran: halaman terakhir penuh, tanpa halaman kosong sesudahnya
+    assert len(halaman) == -(-len(TANGGAL) // ukuran)
+    assert all(len(j["lines"]) == 2 for j in semua)
+
+def test_kursor_dengan_filter(app_modul, backend, monkeypatch):
+    monkeypatch.setattr(app_modul, "penyimpanan", backend)
+    isi_jurnal(backend, TANGGAL)
+    # Nominal 3000..8000 dan tanggal sampai 2025-01-05 -> jurnal 3..8
+    saring = app_modul.baca_filter_jurnal(MultiDict({"min": "3000", "maks": "8000", "sampai": "2025-01-05"}))
+    halaman, _ = jelajah(app_modul, saring, 2)
+    assert [j["description"] for data in halaman for j in data] == [f"jurnal {i}" for i in range(3, 9)]
+
+def test_kursor_kosong_dan_tidak_valid(app_modul, backend, monkeypatch):
+    monkeypatch.setattr(app_modul, "penyimpanan", backend)
+    assert app_modul.ambil_halaman_jurnal(USER_TEST, {}, None, False, 5) == ([], None)
+    for teks in ("", "2025-01-02", "2025-13-01.1", "2025-01-02.x", "a.b.c"):
+        assert app_modul.baca_kursor_jurnal({"lanjut": teks}) is None
+
+def test_kursor_setelah_jurnal_terakhir(app_modul, backend, monkeypatch):
+    monkeypatch.setattr(app_modul, "penyimpanan", backend)
+    isi_jurnal(backend, TANGGAL)
+    terakhir = app_modul.ambil_halaman_jurnal(USER_TEST, {}, None, True, 1)[0][0]
+    assert app_modul.ambil_halaman_jurnal(USER_TEST, {}, (terakhir["date"], terakhir["id"]), False, 5) == ([], None)
+
+@pytest.mark.parametrize("nilai", ["inf", "-inf", "nan", "1e500000", "abc", "1e16"])
+def test_filter_nominal_tidak_valid_diabaikan(app_modul, nilai):
+    assert app_modul.baca_filter_jurnal(MultiDict({"min": nilai, "maks": nilai})) == {}
+
+def test_filter_jurnal(app_modul):
+    saring = app_modul.baca_filter_jurnal(MultiDict({
+        "dari": "2025-01-01", "sampai": "31-01-2025", "akun": " 1-1100 ", "min": "1.5", "cari": "x" * 200,
+    }))
+    assert saring == {"dari": "2025-01-01", "akun": "1-1100", "min": 150, "cari": "x" * 100}
+
+@pytest.mark.parametrize("query", ["min=inf", "maks=nan", "min=1e500000", "lanjut=2025-01-02.abc"])
+def test_route_jurnal_input_aneh_bukan_500(client, query):
+    for route in ("/jurnal", "/histori"):
+        assert client.get(f"{route}?{query}").status_code == 200
+
+@pytest.mark.parametrize("query, nomor", [
+    # Hanya maks: baris kredit (debit 0) tidak boleh membuat semua jurnal lolos
+    ({"maks": "2000"}, [1, 2]),
+    ({"min": "9000"}, [9, 10]),
+    ({"min": "0"}, list(range(1, 11))),
+    ({"maks": "500"}, []),
+])
+def test_filter_nominal_satu_sisi(app_modul, backend, monkeypatch, query, nomor):
+    monkeypatch.setattr(app_modul, "penyimpanan", backend)
+    isi_jurnal(backend, TANGGAL)
+    saring = app_modul.baca_filter_jurnal(MultiDict(query))
+    halaman, _ = jelajah(app_modul, saring, 3)
+    assert [j["description"] for data in halaman for j in data] == [f"jurnal {i}" for i in nomor]
+
+KETERANGAN_KHUSUS = ["Diskon 10% (promo_A)", "Diskon 100 promoXA", "harga*2, kas\\bank", "harga 2 kas bank", "Penjualan"]
+
+@pytest.mark.parametrize("cari, hasil", [
+    ("10%", ["Diskon 10% (promo_A)"]),
+    ("promo_a", ["Diskon 10% (promo_A)"]),
+    ("% (", ["Diskon 10% (promo_A)"]),
+    ("*2,", ["harga*2, kas\\bank"]),
+    ("kas\\b", ["harga*2, kas\\bank"]),
+    (")", ["Diskon 10% (promo_A)"]),
+    ("diskon", ["Diskon 10% (promo_A)", "Diskon 100 promoXA"]),
+    ("_", ["Diskon 10% (promo_A)"]),
+    ("%", ["Diskon 10% (promo_A)"]),
+])
+def test_cari_karakter_khusus_sama_di_semua_backend(app_modul, backend, monkeypatch, cari, hasil):
+    monkeypatch.setattr(app_modul, "penyimpanan", backend)
+    for i, keterangan in enumerate(KETERANGAN_KHUSUS, 1):
+        backend.simpan_jurnal(USER_TEST, f"2025-02-0{i}", keterangan, [
+            {"account_code": "1-1100", "account_name": "Kas", "debit": 1000, "credit": 0},
+            {"account_code": "4-1110", "account_name": "Penjualan Belut Standar", "debit": 0, "credit": 1000},
+        ])
+    saring = app_modul.baca_filter_jurnal(MultiDict({"cari": cari}))
+    data, _ = app_modul.ambil_halaman_jurnal(USER_TEST, saring, None, False, 50)
+    assert [j["description"] for j in data] == hasil
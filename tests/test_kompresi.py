@@ -0,0 +1,111 @@
+import gzip
+
+import pytest
+from flask import Flask, Response, stream_with_context
+
+from kompresi import KompresiRespons, brotli, pilih_encoding
+
+HTML = ("<tr><td>Kas</td><td>Rp 1.000</td></tr>\n" * 200).encode()
+
+@pytest.fixture
+def klien():
+    app = Flask(__name__)
+
+    @app.route("/html")
+    def html():
+        resp = Response(HTML, mimetype="text/html")
+        resp.set_etag("laporan-1")
+        return resp
+
+    @app.route("/kecil")
+    def kecil():
+        return Response(b"<p>ok</p>", mimetype="text/html")
+
+    @app.route("/gambar")
+    def gambar():
+        return Response(b"\x89PNG" + b"\0" * 4000, mimetype="image/png")
+
+    @app.route("/sudah")
+    def sudah():
+        return Response(gzip.compress(HTML), mimetype="text/html", headers={"Content-Encoding": "gzip"})
+
+    @app.route("/stream")
+    def stream():
+        def potongan():
+            for i in range(50):
+                yield HTML[:500]
+        return Response(stream_with_context(potongan()), mimetype="text/html")
+
+    app.wsgi_app = KompresiRespons(app.wsgi_app, ukuran_minimum=1024)
+    return app.test_client()
+
+def vary(res):
+    return {v.strip().lower() for v in res.headers.get("Vary", "").split(",") if v.strip()}
+
+def test_gzip(klien):
+    res = klien.get("/html", headers={"Accept-Encoding": "gzip"})
+    assert res.headers["Content-Encoding"] == "gzip"
+    assert "accept-encoding" in vary(res)
+    assert "Content-Length" not in res.headers
+    # ETag kuat diturunkan menjadi lemah untuk isi terkompres
+    assert res.headers["ETag"] == 'W/"laporan-1"'
+    assert gzip.decompress(res.get_data()) == HTML
+
+@pytest.mark.skipif(brotli is None, reason="paket brotli tidak terpasang")
+def test_brotli_diutamakan(klien):
+    res = klien.get("/html", headers={"Accept-Encoding": "gzip, deflate, br"})
+    assert res.headers["Content-Encoding"] == "br"
+    assert "accept-encoding" in vary(res)
+    assert brotli.decompress(res.get_data()) == HTML
+
+@pytest.mark.parametrize("accept", [None, "identity", "gzip;q=0", "deflate"])
+def test_tanpa_encoding_yang_diterima(klien, accept):
+    res = klien.get("/html", headers={"Accept-Encoding": accept} if accept else {})
+    assert "Content-Encoding" not in res.headers
+    assert "accept-encoding" in vary(res)
+    assert res.headers["ETag"] == '"laporan-1"'
+    assert res.get_data() == HTML
+
+def test_respons_kecil_tidak_dikompres(klien):
+    res = klien.get("/kecil", headers={"Accept-Encoding": "gzip"})
+    assert "Content-Encoding" not in res.headers
+    assert "accept-encoding" in vary(res)
+
+def test_bukan_teks_tidak_disentuh(klien):
+    res = klien.get("/gambar", headers={"Accept-Encoding": "gzip"})
+    assert "Content-Encoding" not in res.headers
+    assert "accept-encoding" not in vary(res)
+
+def test_sudah_terkompres_tidak_dikompres_ulang(klien):
+    res = klien.get("/sudah", headers={"Accept-Encoding": "gzip"})
+    assert res.headers["Content-Encoding"] == "gzip"
+    assert gzip.decompress(res.get_data()) == HTML
+
+def test_head_tidak_dikompres(klien):
+    res = klien.head("/html", headers={"Accept-Encoding": "gzip"})
+    assert "Content-Encoding" not in res.headers
+    assert "accept-encoding" in vary(res)
+
+def test_stream_dikompres(klien):
+    res = klien.get("/stream", headers={"Accept-Encoding": "gzip"})
+    assert res.headers["Content-Encoding"] == "gzip"
+    assert "accept-encoding" in vary(res)
+    assert gzip.decompress(res.get_data()) == HTML[:500] * 50
+
+def test_respons_aplikasi(client):
+    res = client.get("/laporan_laba_rugi", headers={"Accept-Encoding": "gzip"})
+    assert res.status_code == 200
+    assert res.headers["Content-Encoding"] == "gzip"
+    assert "accept-encoding" in vary(res)
+    assert b"Laporan Laba Rugi" in gzip.decompress(res.get_data())
+
+@pytest.mark.parametrize("accept, tersedia, hasil", [
+    ("gzip, br", ("br", "gzip"), "br"),
+    ("gzip, br", ("gzip",), "gzip"),
+    ("br;q=0, gzip", ("br", "gzip"), "gzip"),
+    ("*", ("br", "gzip"), "br"),
+    ("br", ("gzip",), None),
+    ("", ("br", "gzip"), None),
+])
+def test_pilih_encoding(accept, tersedia, hasil):
+    assert pilih_encoding(accept, tersedia) == hasil
@@ -0,0 +1,81 @@
+from werkzeug.datastructures import MultiDict
+
+from conftest import USER_TEST
+from uang import ke_sen
+
+USER_LAIN = "lain@belut.id"
+
+def isi_ledger(app_modul, backend, user):
+    backend.simpan_saldo_awal(user, {"account_code": "1-1100", "account_name": "Kas", "debit": "10000000.55", "credit": 0})
+    backend.simpan_saldo_awal(user, {"account_code": "3-1100", "account_name": "Modal", "debit": 0, "credit": "10000000.55"})
+    transaksi = [
+        ("2025-01-03", "Penjualan", ("1-1100", "Kas"), ("4-1110", "Penjualan Belut Standar"), "750000"),
+        ("2025-01-04", "Penjualan kredit", ("1-1200", "Piutang Dagang"), ("4-1120", "Penjualan Belut Super"), "1333.33"),
+        ("2025-01-05", "Bibit", ("5-1210", "Pembelian Bibit Belut Standar"), ("1-1100", "Kas"), "150000"),
+        ("2025-01-06", "Listrik", ("6-1100", "Beban Listrik dan Air"), ("1-1110", "Kas di Bank"), "75000.10"),
+        ("2025-01-07", "Prive", ("3-1200", "Prive"), ("1-1100", "Kas"), "50000"),
+    ]
+    for tanggal, ket, (kd, nd), (kk, nk), nominal in transaksi:
+        backend.simpan_jurnal(user, tanggal, ket, [
+            {"account_code": kd, "account_name": nd, "debit": nominal, "credit": 0},
+            {"account_code": kk, "account_name": nk, "debit": 0, "credit": nominal},
+        ])
+    form = MultiDict({jenis["field"]: "120000" for jenis in app_modul.JENIS_PENYESUAIAN.values()})
+    baris = [b for jenis in app_modul.JENIS_PENYESUAIAN for b in app_modul.baris_penyesuaian(jenis, "2025-01-31", form)]
+    backend.simpan_penyesuaian(user, [
+        dict(b, debit=app_modul.sen_ke_angka(b["debit"]), credit=app_modul.sen_ke_angka(b["credit"])) for b in baris
+    ])
+
+def rekap_lama(backend, user, penyesuaian):
+    """
+    Perhitungan neraca saldo sebelum Ledger: jumlahkan setiap baris jurnal umum,
+    (jurnal penyesuaian,) dan saldo awal per kode akun
+    """
+    rekap = {}
+    def tambah(kode, debit, kredit):
+        data = rekap.setdefault(kode, [0, 0])
+        data[0] += ke_sen(debit)
+        data[1] += ke_sen(kredit)
+    for row in backend.semua_jurnal(user):
+        for b in row["lines"]:
+            tambah(b.get("account_code"), b.get("debit"), b.get("credit"))
+    if penyesuaian:
+        for row in backend.semua_penyesuaian(user):
+            if row.get("ref"):
+                tambah(row["ref"], row.get("debit"), row.get("credit"))
+    for o in backend.semua_saldo_awal(user):
+        tambah(o["account_code"], o.get("debit"), o.get("credit"))
+    return rekap
+
+def total(akun_dict):
+    return {kode: [d["total_debit"], d["total_kredit"]] for kode, d in akun_dict.items()}
+
+def test_ledger_sama_dengan_perhitungan_lama(app_modul, backend, monkeypatch):
+    monkeypatch.setattr(app_modul, "penyimpanan", backend)
+    isi_ledger(app_modul, backend, USER_TEST)
+    isi_ledger(app_modul, backend, USER_LAIN)
+    backend.simpan_saldo_awal(USER_LAIN, {"account_code": "1-1100", "account_name": "Kas", "debit": "999", "credit": 0})
+
+    for ledger in (app_modul.Ledger.muat(USER_TEST),
+                   app_modul.Ledger.dari_snapshot(app_modul.SnapshotLedger(USER_TEST))):
+        assert total(ledger.sebelum_penyesuaian) == rekap_lama(backend, USER_TEST, penyesuaian=False)
+        assert total(ledger.setelah_penyesuaian) == rekap_lama(backend, USER_TEST, penyesuaian=True)
+
+def test_ledger_seimbang_dan_pecahan_sen(app_modul, backend, monkeypatch):
+    monkeypatch.setattr(app_modul, "penyimpanan", backend)
+    isi_ledger(app_modul, backend, USER_TEST)
+    ledger = app_modul.Ledger.muat(USER_TEST)
+
+    for akun_dict in (ledger.sebelum_penyesuaian, ledger.setelah_penyesuaian, ledger.setelah_penutupan):
+        assert sum(d["total_debit"] for d in akun_dict.values()) == sum(d["total_kredit"] for d in akun_dict.values())
+    # 10.000.000,55 + 750.000 - 150.000 - 50.000 (sen)
+    assert ledger.saldo("1-1100") == 1055000055
+    assert ledger.saldo("4-1120", "kredit") == 133333
+    assert ledger.total("1-1110", "umum") == (0, 7500010)
+    assert ledger.total("1-1100", "saldo_awal") == (1000000055, 0)
+
+def test_ledger_kosong(app_modul, backend, monkeypatch):
+    monkeypatch.setattr(app_modul, "penyimpanan", backend)
+    ledger = app_modul.Ledger.muat(USER_TEST)
+    assert ledger.sebelum_penyesuaian == {} and ledger.setelah_penyesuaian == {}
+    assert ledger.saldo("1-1100") == 0
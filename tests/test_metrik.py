@@ -0,0 +1,127 @@
+import math, re
+
+import pytest
+
+from metrik import CONTENT_TYPE, RegistriMetrik
+
+RE_SAMPEL = re.compile(r'^([a-zA-Z_:][a-zA-Z0-9_:]*)(?:\{(.*)\})? (\S+)$')
+RE_LABEL = re.compile(r'([a-zA-Z_][a-zA-Z0-9_]*)="((?:[^"\\\n]|\\[\\"n])*)"(,|$)')
+
+def parse_teks(teks):
+    """
+    Parse format teks Prometheus 0.0.4 dengan ketat:
+    {nama keluarga: {"help", "type", "sampel": [(nama, label dict, nilai)]}}
+    """
+    assert teks.endswith("\n")
+    keluarga, sekarang = {}, None
+    for baris in teks[:-1].split("\n"):
+        if baris.startswith("# HELP "):
+            nama, bantuan = baris[7:].split(" ", 1)
+            assert nama not in keluarga, f"HELP ganda {nama}"
+            keluarga[nama] = {"help": bantuan, "type": None, "sampel": []}
+            sekarang = nama
+        elif baris.startswith("# TYPE "):
+            nama, tipe = baris[7:].split(" ")
+            assert nama == sekarang and keluarga[nama]["type"] is None
+            assert tipe in ("counter", "gauge", "histogram", "summary", "untyped")
+            keluarga[nama]["type"] = tipe
+        else:
+            m = RE_SAMPEL.match(baris)
+            assert m, f"baris tidak valid: {baris!r}"
+            nama, teks_label, nilai = m.groups()
+            label = {}
+            if teks_label:
+                posisi = 0
+                while posisi < len(teks_label):
+                    l = RE_LABEL.match(teks_label, posisi)
+                    assert l, f"label tidak valid: {teks_label!r}"
+                    assert l.group(1) not in label
+                    label[l.group(1)] = l.group(2)
+                    posisi = l.end()
+            assert sekarang and keluarga[sekarang]["type"], f"sampel tanpa TYPE: {baris!r}"
+            akhiran = ("_bucket", "_sum", "_count") if keluarga[sekarang]["type"] == "histogram" else ("",)
+            assert any(nama == sekarang + a for a in akhiran), f"{nama} di luar keluarga {sekarang}"
+            keluarga[sekarang]["sampel"].append((nama, label, float(nilai)))
+    return keluarga
+
+def cek_histogram(nama, data):
+    per_seri = {}
+    for sampel, label, nilai in data["sampel"]:
+        kunci = tuple(sorted((k, v) for k, v in label.items() if k != "le"))
+        per_seri.setdefault(kunci, {"bucket": [], "sum": None, "count": None})
+        if sampel.endswith("_bucket"):
+            per_seri[kunci]["bucket"].append((float(label["le"]), nilai))
+        else:
+            per_seri[kunci][sampel[len(nama) + 1:]] = nilai
+    for seri in per_seri.values():
+        batas = [le for le, _ in seri["bucket"]]
+        jumlah = [n for _, n in seri["bucket"]]
+        assert batas == sorted(batas) and batas[-1] == math.inf
+        assert jumlah == sorted(jumlah), "bucket harus kumulatif"
+        assert seri["count"] == jumlah[-1] and seri["sum"] is not None
+    return per_seri
+
+def cek_format(teks):
+    keluarga = parse_teks(teks)
+    for nama, data in keluarga.items():
+        if data["type"] == "counter":
+            assert nama.endswith("_total")
+        if data["type"] == "histogram":
+            cek_histogram(nama, data)
+    return keluarga
+
+def test_registri():
+    r = RegistriMetrik()
+    c = r.counter("uji_total", "Counter uji", ("jenis",))
+    g = r.gauge("uji_gauge", "Gauge uji", fungsi=lambda: 0.25)
+    h = r.histogram("uji_detik", "Histogram uji", ("route",), bucket=(0.1, 1))
+    c.inc(jenis='a"b\\c\nd')
+    c.inc(2, jenis="biasa")
+    for nilai in (0.05, 0.1, 0.5, 3):
+        h.observe(nilai, route="/x")
+
+    keluarga = cek_format(r.teks())
+    assert keluarga["uji_total"]["sampel"] == [
+        ("uji_total", {"jenis": 'a\\"b\\\\c\\nd'}, 1.0), ("uji_total", {"jenis": "biasa"}, 2.0),
+    ]
+    assert keluarga["uji_gauge"]["sampel"] == [("uji_gauge", {}, 0.25)]
+    seri = cek_histogram("uji_detik", keluarga["uji_detik"])[(("route", "/x"),)]
+    # le=0.1 inklusif: 0.05 dan 0.1
+    assert seri["bucket"] == [(0.1, 2), (1.0, 3), (math.inf, 4)]
+    assert seri["sum"] == pytest.approx(3.65) and seri["count"] == 4
+    assert 'le="+Inf"' in r.teks() and 'le="1"' in r.teks()
+
+def test_registri_menolak_nama_ganda_dan_label_salah():
+    r = RegistriMetrik()
+    c = r.counter("uji_total", "Counter uji", ("jenis",))
+    with pytest.raises(ValueError):
+        r.counter("uji_total", "lagi")
+    with pytest.raises(ValueError):
+        c.inc(lain="x")
+
+def test_endpoint_metrics(app_modul, client):
+    assert client.get("/laporan_laba_rugi").status_code == 200
+    assert client.get("/laporan_laba_rugi").status_code == 200
+
+    res = client.get("/metrics")
+    assert res.status_code == 200
+    assert res.headers["Content-Type"] == CONTENT_TYPE
+    keluarga = cek_format(res.get_data(as_text=True))
+
+    durasi = keluarga["belut_request_duration_seconds"]
+    assert any(nama.endswith("_count") and label == {"route": "/laporan_laba_rugi", "method": "GET", "status": "200"}
+               and nilai >= 2 for nama, label, nilai in durasi["sampel"])
+    assert any(nilai > 0 for _, _, nilai in keluarga["belut_backend_queries_total"]["sampel"])
+    assert {label["hasil"] for _, label, _ in keluarga["belut_report_cache_lookups_total"]["sampel"]} >= {"hit", "miss"}
+    assert 0 <= keluarga["belut_report_cache_hit_ratio"]["sampel"][0][2] <= 1
+
+def test_endpoint_metrics_token(app_modul, monkeypatch):
+    monkeypatch.setattr(app_modul, "TOKEN_METRIK", "rahasia")
+    c = app_modul.app.test_client()
+    assert c.get("/metrics").status_code == 401
+    assert c.get("/metrics", headers={"Authorization": "Bearer salah"}).status_code == 401
+    assert c.get("/metrics", headers={"Authorization": "Bearer rahasia"}).status_code == 200
+
+def test_endpoint_metrics_mati(app_modul, monkeypatch):
+    monkeypatch.setattr(app_modul, "METRIK_AKTIF", False)
+    assert app_modul.app.test_client().get("/metrics").status_code == 404
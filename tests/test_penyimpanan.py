@@ -0,0 +1,93 @@
+import pytest
+
+import profil
+from penyimpanan import Penyimpanan
+
+from conftest import USER_TEST
+
+def test_backend_tidak_lengkap_gagal_saat_dibuat():
+    class BackendSetengah(Penyimpanan):
+        def cari_user(self, email):
+            return None
+
+    with pytest.raises(TypeError, match="saldo_akun"):
+        BackendSetengah()
+
+def test_semua_method_antarmuka_abstrak():
+    assert Penyimpanan.__abstractmethods__ == {
+        nama for nama, fungsi in vars(Penyimpanan).items() if not nama.startswith("_") and callable(fungsi)
+    }
+
+def test_method_backend_diukur_sebagai_fase_db(backend):
+    assert not getattr(type(backend).saldo_akun, "__isabstractmethod__", False)
+    p = profil.mulai()
+    try:
+        assert list(backend.semua_jurnal(USER_TEST)) == []
+        backend.saldo_akun(USER_TEST)
+    finally:
+        profil.selesai()
+    assert p.fase.get("db", 0) > 0
+    assert p.jumlah_query >= 2
+
+def test_saldo_bulanan_cadangan_dijumlah_dalam_sen(tmp_path):
+    import datetime
+    from postgrest_palsu import TransportPostgREST, buat_client_palsu
+    from penyimpanan.db_supabase import PenyimpananSupabase
+    from uang import ke_sen
+
+    transport = TransportPostgREST(str(tmp_path / "ledger.db"), tanpa_tabel=["account_balances_bulanan"])
+    backend = PenyimpananSupabase(buat_client_palsu(transport))
+    # 0.1 + 0.2 + ... sebagai float tidak pas di sen (0.30000000000000004 dst.)
+    for i, nominal in enumerate(["0.10", "0.20", "0.70", "1234567.89", "0.01"] * 3):
+        backend.simpan_jurnal(USER_TEST, f"2025-03-{i + 1:02d}", f"jurnal {i}", [
+            {"account_code": "1-1100", "account_name": "Kas", "debit": nominal, "credit": 0},
+            {"account_code": "4-1110", "account_name": "Penjualan Belut Standar", "debit": 0, "credit": nominal},
+        ])
+    backend.simpan_jurnal(USER_TEST, "2025-04-01", "bulan lain", [
+        {"account_code": "1-1100", "account_name": "Kas", "debit": 5, "credit": 0},
+        {"account_code": "4-1110", "account_name": "Penjualan Belut Standar", "debit": 0, "credit": 5},
+    ])
+
+    rows = backend.saldo_akun_bulanan(USER_TEST, datetime.date(2025, 3, 1))
+    assert any(c["tabel"] == "account_balances_bulanan" and c["status"] == 404 for c in transport.catatan)
+    total = {r["account_code"]: (ke_sen(r["total_debit"]), ke_sen(r["total_kredit"])) for r in rows}
+    assert total == {"1-1100": (370370670, 0), "4-1110": (0, 370370670)}
+    assert all(not isinstance(r[k], float) for r in rows for k in ("total_debit", "total_kredit"))
+    # Sama dengan tabel account_balances_bulanan yang dipelihara trigger SQLite
+    sqlite = {r["account_code"]: (ke_sen(r["total_debit"]), ke_sen(r["total_kredit"]))
+              for r in transport.db.saldo_akun_bulanan(USER_TEST, datetime.date(2025, 3, 1))}
+    assert total == sqlite
+
+@pytest.mark.parametrize("tanpa_tabel", [(), ("rekap_saldo_akun",)])
+def test_saldo_akun_supabase_lewat_rpc_rekap_saldo_akun(tmp_path, tanpa_tabel):
+    from postgrest_palsu import TransportPostgREST, buat_client_palsu
+    from penyimpanan.db_supabase import PenyimpananSupabase
+    from uang import ke_sen
+
+    transport = TransportPostgREST(str(tmp_path / "ledger.db"), tanpa_tabel=tanpa_tabel)
+    backend = PenyimpananSupabase(buat_client_palsu(transport))
+    backend.simpan_jurnal(USER_TEST, "2025-03-01", "jual belut", [
+        {"account_code": "1-1100", "account_name": "Kas", "debit": "1234567.89", "credit": 0},
+        {"account_code": "4-1110", "account_name": "Penjualan Belut Standar", "debit": 0, "credit": "1234567.89"},
+    ])
+    backend.simpan_saldo_awal(USER_TEST, {"account_code": "1-1100", "account_name": "Kas", "debit": "500000.10", "credit": 0})
+    transport.reset()
+
+    rows = backend.saldo_akun(USER_TEST)
+    rpc = [c for c in transport.catatan if c["tabel"] == "rpc/rekap_saldo_akun"]
+    if tanpa_tabel:
+        # Fungsi belum ada (404): baca tabel account_balances langsung
+        assert rpc[0]["status"] == 404
+        assert any(c["tabel"] == "account_balances" for c in transport.catatan)
+    else:
+        assert [c["tabel"] for c in transport.catatan] == ["rpc/rekap_saldo_akun"]
+
+    # Sama dengan account_balances yang dipelihara trigger SQLite
+    def sen(rows):
+        return [(r["account_code"], r["stage"], ke_sen(r["total_debit"]), ke_sen(r["total_kredit"])) for r in rows]
+    assert sen(rows) == sen(transport.db.saldo_akun(USER_TEST))
+    assert sen(rows) == [
+        ("1-1100", "saldo_awal", 50000010, 0),
+        ("1-1100", "umum", 123456789, 0),
+        ("4-1110", "umum", 0, 123456789),
+    ]
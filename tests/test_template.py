@@ -0,0 +1,30 @@
+import pytest
+
+NAMA_JAHAT = '<img src=x onerror="alert(1)">'
+
+@pytest.mark.parametrize("template, konteks", [
+    ("laporan_laba_rugi.html", {"pendapatan_items": [{"nama": NAMA_JAHAT, "nilai": 150000}], "laba_bersih": 0}),
+    ("laporan_posisi_keuangan.html", {"aset_lancar_items": [{"nama": NAMA_JAHAT, "nilai": 150000}],
+                                      "total_kewajiban_lancar_num": 0, "total_kewajiban_panjang_num": 0}),
+    ("laporan_arus_kas.html", {"arus_kas_operasi": [{"nama": NAMA_JAHAT, "nilai": 0, "keluar": True}]}),
+    ("transaksi_penjualan.html", {"akun_penjualan": [{"kode": "4-1110", "nama": NAMA_JAHAT}]}),
+    ("transaksi_pembelian.html", {"akun_pembelian": [{"kode": "5-1210", "nama": NAMA_JAHAT}]}),
+    ("transaksi_lainnya.html", {"akun_lainnya": [{"kode": "1-1100", "nama": NAMA_JAHAT, "kategori": NAMA_JAHAT}]}),
+])
+def test_nama_akun_di_escape(app_modul, template, konteks):
+    from flask import render_template
+    with app_modul.app.test_request_context():
+        html = render_template(template, **konteks)
+    assert NAMA_JAHAT not in html
+    assert "&lt;img src=x onerror=" in html
+
+def test_baris_nilai(app_modul):
+    with app_modul.app.test_request_context():
+        tabel = app_modul.app.jinja_env.get_template("_tabel.html").module
+        html = str(tabel.baris_nilai([
+            {"nama": "Kas", "nilai": 1500000},
+            {"nama": "Prive", "nilai": 5000000, "keluar": True},
+            {"nama": "Kosong", "nilai": 0, "keluar": True},
+        ], indent=30, nol="Rp -"))
+    assert '<td style="padding-left:30px;">Kas</td>' in html
+    assert ">Rp 15.000<" in html and ">-Rp 50.000<" in html and ">-Rp -<" in html
@@ -0,0 +1,94 @@
+from decimal import Decimal
+
+import pytest
+
+from uang import BATAS_SEN, bagi_sen, kali_sen, ke_desimal, ke_sen, rupiah_sen, sen_ke_angka
+
+@pytest.mark.parametrize("nilai, sen", [
+    (None, 0),
+    ("", 0),
+    (0, 0),
+    (1500, 150000),
+    ("1500", 150000),
+    (" 1500.5 ", 150050),
+    ("0.005", 1),
+    ("-0.005", -1),
+    ("0.0049", 0),
+    (0.1, 10),
+    (1.005, 101),
+    (Decimal("12.345"), 1235),
+    ("1e3", 100000),
+    ("1e-500000", 0),
+    ("9999999999999999.99", BATAS_SEN - 1),
+])
+def test_ke_sen(nilai, sen):
+    assert ke_sen(nilai) == sen
+
+@pytest.mark.parametrize("nilai", [
+    "abc", "1,5", "inf", "-inf", "Infinity", "nan", "NaN", "sNaN",
+    float("inf"), float("nan"), Decimal("NaN"),
+    "1e500000", "-1e500000", "1e16", "9999999999999999.995", 10 ** 16, -10 ** 16,
+])
+def test_ke_sen_menolak(nilai):
+    with pytest.raises(ValueError):
+        ke_sen(nilai)
+
+def test_ke_sen_eksponen_raksasa_langsung_ditolak():
+    # Dulu '1e500000' diubah menjadi int 500 ribu digit (worker macet ~10 detik)
+    import time
+    mulai = time.perf_counter()
+    with pytest.raises(ValueError):
+        ke_sen("9" * 20 + "e499980")
+    assert time.perf_counter() - mulai < 0.1
+
+def test_ke_desimal():
+    assert ke_desimal("2.50") == Decimal("2.50")
+    with pytest.raises(ValueError, match="Kuantitas"):
+        ke_desimal("x", "Kuantitas")
+
+@pytest.mark.parametrize("sen, pembagi, hasil", [
+    (1000, 3, 333),
+    (1000, 6, 167),
+    (5, 2, 3),
+    (-5, 2, -3),
+    (-1000, 6, -167),
+    (0, 7, 0),
+])
+def test_bagi_sen(sen, pembagi, hasil):
+    assert bagi_sen(sen, pembagi) == hasil
+
+@pytest.mark.parametrize("sen, jumlah, hasil", [
+    (2500000, "1.5", 3750000),
+    (2500000, Decimal("0.333"), 832500),
+    (333, "0.5", 167),
+    (-333, "0.5", -167),
+    (100, 3, 300),
+])
+def test_kali_sen(sen, jumlah, hasil):
+    assert kali_sen(sen, jumlah) == hasil
+
+@pytest.mark.parametrize("jumlah", ["inf", "nan", "1e500000", "x"])
+def test_kali_sen_menolak_jumlah(jumlah):
+    with pytest.raises(ValueError):
+        kali_sen(100, jumlah)
+
+def test_kali_sen_menolak_hasil_di_luar_numeric():
+    with pytest.raises(ValueError):
+        kali_sen(BATAS_SEN // 2, 2)
+
+def test_sen_ke_angka_tanpa_float():
+    assert sen_ke_angka(150000) == 1500 and isinstance(sen_ke_angka(150000), int)
+    assert sen_ke_angka(-150000) == -1500
+    angka = sen_ke_angka(150050)
+    assert isinstance(angka, Decimal) and str(angka) == "1500.50"
+    assert str(sen_ke_angka(-1)) == "-0.01"
+    assert ke_sen(sen_ke_angka(123456789)) == 123456789
+
+@pytest.mark.parametrize("sen, teks", [
+    (0, "Rp 0"),
+    (123456789, "Rp 1.234.567"),
+    (-123456789, "Rp -1.234.567"),
+    (-50, "Rp 0"),
+])
+def test_rupiah_sen(sen, teks):
+    assert rupiah_sen(sen) == teks